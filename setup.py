@@ -43,6 +43,13 @@ setup(
             "black>=21.0",
             "flake8>=3.8",
         ],
+        "fast": [
+            "numba>=0.55",
+            "orjson>=3.6",
+        ],
+        "parquet": [
+            "pyarrow>=8.0",
+        ],
     },
     entry_points={
         "console_scripts": [
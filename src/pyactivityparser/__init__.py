@@ -8,7 +8,7 @@ for processing and analyzing accelerometer data.
 __version__ = "0.1.0"
 __author__ = "pyActivityParser Development Team"
 
-from .main import PyActivityParser
+from .main import PyActivityParser, configure_logging
 from .data_loader import AccelerometerDataLoader
 from .core_analysis import CoreAnalysis
 from .quality_assessment import QualityAssessment
@@ -23,5 +23,6 @@ __all__ = [
     "QualityAssessment",
     "ActivityAnalysis",
     "SleepAnalysis",
-    "ReportGenerator"
+    "ReportGenerator",
+    "configure_logging"
 ]
\ No newline at end of file
@@ -0,0 +1,639 @@
+"""
+Numerical Kernels for PyActivityParser
+
+Hot sequential loops shared by the analysis modules. When Numba is installed
+the kernels are JIT-compiled into single fused passes; otherwise equivalent
+vectorized NumPy implementations are used.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Tuple
+
+try:
+    from numba import get_num_threads, njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    NUMBA_AVAILABLE = False
+
+
+def widen_float32(values) -> np.ndarray:
+    """
+    Widen float32 values to the float64 numbers of their shortest decimal repr.
+
+    A plain cast exposes the float32 rounding (1350.3 becomes 1350.300048828125); the
+    shortest repr is the decimal the sample was parsed from. Meant for reported order
+    statistics (min, max, median), not for whole recordings.
+
+    Args:
+        values: float32 scalar or array
+
+    Returns:
+        np.ndarray: float64 values of the same shape (0-d for a scalar)
+    """
+    return np.asarray(values, dtype=np.float32).astype(str).astype(np.float64)
+
+
+def _find_bouts_numpy(mask: np.ndarray, acc: np.ndarray,
+                      min_samples: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized run-length encoding of `mask` with per-run mean/max of `acc`."""
+    # Rising edges are starts, falling edges are (exclusive) ends
+    edges = np.flatnonzero(np.diff(mask.astype(np.int8), prepend=0, append=0))
+    starts = edges[0::2]
+    ends = edges[1::2]
+
+    # Keep runs meeting the minimum duration
+    keep = (ends - starts) >= min_samples
+    starts = starts[keep]
+    ends = ends[keep]
+
+    if len(starts) == 0:
+        return starts, ends, np.empty(0), np.empty(0)
+
+    # Per-run mean/max over the [start, end) segments in one pass each, accumulated in
+    # float64 like the Numba kernel so both paths return the same numbers
+    segment_bounds = np.column_stack((starts, ends)).ravel()
+    if segment_bounds[-1] == len(acc):
+        segment_bounds = segment_bounds[:-1]
+    values = acc.astype(np.float64)
+    means = np.add.reduceat(values, segment_bounds)[0::2] / (ends - starts)
+    maxes = np.maximum.reduceat(values, segment_bounds)[0::2]
+
+    return starts, ends, means, maxes
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, fastmath=True)
+    def _find_bouts_numba(mask, acc, min_samples):
+        n = mask.shape[0]
+        # Runs are separated by at least one False sample
+        capacity = min(n // max(min_samples, 1), (n + 1) // 2) + 1
+        starts = np.empty(capacity, dtype=np.int64)
+        ends = np.empty(capacity, dtype=np.int64)
+        means = np.empty(capacity, dtype=np.float64)
+        maxes = np.empty(capacity, dtype=np.float64)
+
+        count = 0
+        run_start = -1
+        run_sum = 0.0
+        run_max = 0.0
+        for i in range(n + 1):
+            active = i < n and mask[i]
+            if active:
+                value = acc[i]
+                if run_start < 0:
+                    run_start = i
+                    run_sum = value
+                    run_max = value
+                else:
+                    run_sum += value
+                    if value > run_max:
+                        run_max = value
+            elif run_start >= 0:
+                length = i - run_start
+                if length >= min_samples:
+                    starts[count] = run_start
+                    ends[count] = i
+                    means[count] = run_sum / length
+                    maxes[count] = run_max
+                    count += 1
+                run_start = -1
+
+        return starts[:count], ends[:count], means[:count], maxes[:count]
+
+
+def _calendar_histograms_numpy(hour: np.ndarray, dow: np.ndarray, code: np.ndarray,
+                               acc: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Hour/weekday x intensity counts and per-hour/weekday acceleration reductions."""
+    # Unclassified samples (code -1) are counted in the last column
+    code = np.where(code < 0, 4, code).astype(np.int64)
+    hour = hour.astype(np.int64)
+    dow = dow.astype(np.int64)
+    hour_counts = np.bincount(hour * 5 + code, minlength=24 * 5).reshape(24, 5)
+    dow_counts = np.bincount(dow * 5 + code, minlength=7 * 5).reshape(7, 5)
+
+    valid = ~np.isnan(acc)
+    hour = hour[valid]
+    values = acc[valid].astype(np.float64)
+    hour_sum = np.bincount(hour, weights=values, minlength=24)
+    hour_sumsq = np.bincount(hour, weights=values * values, minlength=24)
+    hour_max = np.full(24, -np.inf)
+    np.maximum.at(hour_max, hour, values)
+    dow_sum = np.bincount(dow[valid], weights=values, minlength=7)
+
+    return hour_counts, hour_sum, hour_sumsq, hour_max, dow_counts, dow_sum
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, cache=True)
+    def _calendar_histograms_numba(hour, dow, code, acc, n_threads):
+        n = acc.shape[0]
+        n_blocks = max(1, min(n_threads, n))
+        block_size = (n + n_blocks - 1) // n_blocks
+
+        # Per-block buffers avoid write contention between threads
+        hour_counts = np.zeros((n_blocks, 24, 5), dtype=np.int64)
+        dow_counts = np.zeros((n_blocks, 7, 5), dtype=np.int64)
+        hour_sum = np.zeros((n_blocks, 24), dtype=np.float64)
+        hour_sumsq = np.zeros((n_blocks, 24), dtype=np.float64)
+        hour_max = np.full((n_blocks, 24), -np.inf)
+        dow_sum = np.zeros((n_blocks, 7), dtype=np.float64)
+
+        for b in prange(n_blocks):
+            for i in range(b * block_size, min(n, (b + 1) * block_size)):
+                h = hour[i]
+                d = dow[i]
+                c = code[i]
+                if c < 0:
+                    c = 4
+                hour_counts[b, h, c] += 1
+                dow_counts[b, d, c] += 1
+                value = np.float64(acc[i])  # Square in float64, like the NumPy path
+                if not np.isnan(value):
+                    hour_sum[b, h] += value
+                    hour_sumsq[b, h] += value * value
+                    if value > hour_max[b, h]:
+                        hour_max[b, h] = value
+                    dow_sum[b, d] += value
+
+        # Reduce the per-block buffers
+        for b in range(1, n_blocks):
+            for h in range(24):
+                for c in range(5):
+                    hour_counts[0, h, c] += hour_counts[b, h, c]
+                hour_sum[0, h] += hour_sum[b, h]
+                hour_sumsq[0, h] += hour_sumsq[b, h]
+                if hour_max[b, h] > hour_max[0, h]:
+                    hour_max[0, h] = hour_max[b, h]
+            for d in range(7):
+                for c in range(5):
+                    dow_counts[0, d, c] += dow_counts[b, d, c]
+                dow_sum[0, d] += dow_sum[b, d]
+
+        return hour_counts[0], hour_sum[0], hour_sumsq[0], hour_max[0], dow_counts[0], dow_sum[0]
+
+
+def calendar_histograms(hour: np.ndarray, dow: np.ndarray, code: np.ndarray,
+                        acc: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Compute hour-of-day and day-of-week activity tables in a single pass.
+
+    Args:
+        hour (np.ndarray): Hour of day (0-23) per sample
+        dow (np.ndarray): Day of week (0=Monday) per sample
+        code (np.ndarray): Intensity code per sample (-1 for unclassified)
+        acc (np.ndarray): Acceleration per sample
+
+    Returns:
+        Dict: 'hour_counts' (24x5) and 'dow_counts' (7x5) sample counts by intensity
+        code (last column = unclassified), plus NaN-skipping 'hour_sum', 'hour_sumsq',
+        'hour_max' and 'dow_sum' acceleration reductions
+    """
+    if NUMBA_AVAILABLE:
+        tables = _calendar_histograms_numba(hour, dow, code, acc, get_num_threads())
+    else:
+        tables = _calendar_histograms_numpy(hour, dow, code, acc)
+
+    keys = ('hour_counts', 'hour_sum', 'hour_sumsq', 'hour_max', 'dow_counts', 'dow_sum')
+    return dict(zip(keys, tables))
+
+
+def _count_spaced_peaks_python(candidates: np.ndarray, min_interval: int) -> int:
+    """Greedy refractory filter over sorted candidate indices."""
+    count = 0
+    last_peak = -min_interval
+    for idx in candidates:
+        if idx - last_peak >= min_interval:
+            count += 1
+            last_peak = idx
+    return count
+
+
+if NUMBA_AVAILABLE:
+    _count_spaced_peaks_numba = njit(cache=True)(_count_spaced_peaks_python)
+
+
+def count_spaced_peaks(candidates: np.ndarray, min_interval: int) -> int:
+    """
+    Count candidate peaks that are at least `min_interval` samples after the last kept peak.
+
+    Args:
+        candidates (np.ndarray): Sorted sample indices exceeding the peak threshold
+        min_interval (int): Minimum spacing between kept peaks in samples
+
+    Returns:
+        int: Number of peaks kept by the greedy refractory filter
+    """
+    if min_interval <= 1 or len(candidates) == 0:
+        # Every candidate is at least one sample after its predecessor
+        return len(candidates)
+    if NUMBA_AVAILABLE:
+        return int(_count_spaced_peaks_numba(candidates, min_interval))
+    return _count_spaced_peaks_python(candidates, min_interval)
+
+
+def find_bouts(mask: np.ndarray, acc: np.ndarray,
+               min_samples: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find runs of True in `mask` lasting at least `min_samples` samples.
+
+    Args:
+        mask (np.ndarray): Boolean activity mask
+        acc (np.ndarray): Acceleration values aligned with `mask`
+        min_samples (int): Minimum run length in samples
+
+    Returns:
+        Tuple: (starts, ends, means, maxes) with half-open [start, end) runs; means and
+        maxes are float64 on both paths
+    """
+    if NUMBA_AVAILABLE:
+        return _find_bouts_numba(mask, acc, min_samples)
+    return _find_bouts_numpy(mask, acc, min_samples)
+
+
+def _rolling_std_threshold_pandas(values: np.ndarray, window: int, threshold: float,
+                                  out: np.ndarray) -> np.ndarray:
+    """Trailing rolling std via pandas, compared against `threshold` into `out`."""
+    rolling_std = pd.Series(values).rolling(window=window, min_periods=1).std().fillna(0)
+    np.greater_equal(rolling_std.to_numpy(), threshold, out=out)
+    return out
+
+
+if NUMBA_AVAILABLE:
+
+    # fastmath is left off in the rolling kernels: it would let the compiler drop the NaN checks
+    @njit(cache=True)
+    def _rolling_window_step(values, i, window, count, mean, ssqdm):
+        """Advance trailing-window Welford moments so they cover samples (i - window, i]."""
+        # Update for the entering sample
+        value = values[i]
+        if not np.isnan(value):
+            count += 1
+            delta = value - mean
+            mean += delta / count
+            ssqdm += delta * (value - mean)
+
+        # Downdate for the sample leaving the trailing window
+        if i >= window:
+            old = values[i - window]
+            if not np.isnan(old):
+                count -= 1
+                if count > 0:
+                    delta = old - mean
+                    mean -= delta / count
+                    ssqdm -= delta * (old - mean)
+                else:
+                    mean = 0.0
+                    ssqdm = 0.0
+        return count, mean, ssqdm
+
+    @njit(cache=True)
+    def _rolling_std_threshold_numba(values, window, threshold, out):
+        count = 0
+        mean = 0.0
+        ssqdm = 0.0
+        for i in range(values.shape[0]):
+            count, mean, ssqdm = _rolling_window_step(values, i, window, count, mean, ssqdm)
+            if count > 1 and ssqdm > 0.0:
+                out[i] = np.sqrt(ssqdm / (count - 1)) >= threshold
+            else:
+                # Fewer than two valid samples count as zero spread
+                out[i] = 0.0 >= threshold
+        return out
+
+    @njit(cache=True)
+    def _rolling_mean_std_numba(values, window):
+        n = values.shape[0]
+        means = np.empty(n, dtype=np.float32)
+        stds = np.empty(n, dtype=np.float32)
+        count = 0
+        mean = 0.0
+        ssqdm = 0.0
+        for i in range(n):
+            count, mean, ssqdm = _rolling_window_step(values, i, window, count, mean, ssqdm)
+            means[i] = mean if count > 0 else np.nan
+            if count > 1:
+                stds[i] = np.sqrt(max(ssqdm, 0.0) / (count - 1))
+            else:
+                stds[i] = np.nan
+        return means, stds
+
+
+def _rolling_mean_below_pandas(values: np.ndarray, window: int, threshold: float,
+                               out: np.ndarray) -> np.ndarray:
+    """Trailing rolling mean via pandas, compared against `threshold` into `out`."""
+    rolling_mean = pd.Series(values).rolling(window=window, min_periods=1).mean()
+    np.less(rolling_mean.to_numpy(), threshold, out=out)
+    return out
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def _rolling_mean_below_numba(values, window, threshold, out):
+        count = 0
+        total = 0.0
+        for i in range(values.shape[0]):
+            # Running sum: add the entering sample, subtract the one leaving the window
+            value = values[i]
+            if not np.isnan(value):
+                count += 1
+                total += value
+            if i >= window:
+                old = values[i - window]
+                if not np.isnan(old):
+                    count -= 1
+                    total -= old
+            if count > 0:
+                out[i] = total / count < threshold
+            else:
+                # An all-missing window has no mean; restart the sum to drop rounding drift
+                total = 0.0
+                out[i] = False
+        return out
+
+
+def _rolling_mean_std_pandas(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Trailing rolling mean and std via pandas, as float32 arrays."""
+    rolling = pd.Series(values).rolling(window=window, min_periods=1)
+    return (rolling.mean().to_numpy(dtype=np.float32),
+            rolling.std().to_numpy(dtype=np.float32))
+
+
+def rolling_mean_std(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Trailing rolling mean and standard deviation in a single pass.
+
+    Args:
+        values (np.ndarray): Samples (NaN values are skipped)
+        window (int): Trailing window length in samples
+
+    Returns:
+        Tuple: float32 (means, stds); the std (ddof=1) is NaN for fewer than two valid samples
+    """
+    if NUMBA_AVAILABLE:
+        return _rolling_mean_std_numba(values, window)
+    return _rolling_mean_std_pandas(values, window)
+
+
+def rolling_mean_below(values: np.ndarray, window: int, threshold: float,
+                       out: np.ndarray) -> np.ndarray:
+    """
+    Compare the trailing rolling mean of `values` against `threshold`.
+
+    Args:
+        values (np.ndarray): Samples (NaN values are skipped)
+        window (int): Trailing window length in samples
+        threshold (float): Exclusive upper bound for the mean
+        out (np.ndarray): Boolean output array, same length as `values`
+
+    Returns:
+        np.ndarray: `out`, True where the window mean is below `threshold`
+        (False for windows without valid samples)
+    """
+    if NUMBA_AVAILABLE:
+        return _rolling_mean_below_numba(values, window, threshold, out)
+    return _rolling_mean_below_pandas(values, window, threshold, out)
+
+
+def rolling_std_threshold(values: np.ndarray, window: int, threshold: float,
+                          out: np.ndarray) -> np.ndarray:
+    """
+    Compare the trailing rolling standard deviation of `values` against `threshold`.
+
+    Args:
+        values (np.ndarray): Samples (NaN values are skipped)
+        window (int): Trailing window length in samples
+        threshold (float): Minimum standard deviation
+        out (np.ndarray): Boolean output array, same length as `values`
+
+    Returns:
+        np.ndarray: `out`, True where the window std (ddof=1, zero for fewer than
+        two valid samples) is at least `threshold`
+    """
+    if NUMBA_AVAILABLE:
+        return _rolling_std_threshold_numba(values, window, threshold, out)
+    return _rolling_std_threshold_pandas(values, window, threshold, out)
+
+
+def _quality_counts_numpy(acc: np.ndarray, imputed: np.ndarray,
+                          outlier_threshold: float) -> Tuple[int, int, int, int]:
+    """Missing, zero, outlier and imputed sample counts via separate NumPy reductions."""
+    return (int(np.count_nonzero(np.isnan(acc))),
+            int(np.count_nonzero(acc == 0)),
+            int(np.count_nonzero(acc > outlier_threshold)),
+            int(np.count_nonzero(imputed)))
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def _quality_counts_numba(acc, imputed, outlier_threshold):
+        missing = 0
+        zeros = 0
+        outliers = 0
+        imputed_count = 0
+        for i in range(acc.shape[0]):
+            value = acc[i]
+            if np.isnan(value):
+                missing += 1
+            elif value == 0:
+                zeros += 1
+            elif value > outlier_threshold:
+                outliers += 1
+            if imputed[i]:
+                imputed_count += 1
+        return missing, zeros, outliers, imputed_count
+
+
+def quality_counts(acc: np.ndarray, imputed: np.ndarray,
+                   outlier_threshold: float) -> Tuple[int, int, int, int]:
+    """
+    Count the per-sample quality flags of a recording in one pass.
+
+    Args:
+        acc (np.ndarray): Acceleration per sample
+        imputed (np.ndarray): Boolean imputation flag per sample
+        outlier_threshold (float): Values above this count as outliers
+
+    Returns:
+        Tuple: (missing, zeros, outliers, imputed) sample counts
+    """
+    if NUMBA_AVAILABLE:
+        counts = _quality_counts_numba(acc, imputed, outlier_threshold)
+        return tuple(int(count) for count in counts)
+    return _quality_counts_numpy(acc, imputed, outlier_threshold)
+
+
+def _outlier_counts_numpy(values: np.ndarray, lower: float, upper: float,
+                          mean: float, max_deviation: float) -> Tuple[int, int]:
+    """IQR and z-score outlier counts via NumPy masks."""
+    return (int(np.count_nonzero((values < lower) | (values > upper))),
+            int(np.count_nonzero(np.abs(values - mean) > max_deviation)))
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, cache=True)
+    def _outlier_counts_numba(values, lower, upper, mean, max_deviation):
+        iqr_count = 0
+        z_count = 0
+        for i in prange(values.shape[0]):
+            value = values[i]
+            if value < lower or value > upper:
+                iqr_count += 1
+            if abs(value - mean) > max_deviation:
+                z_count += 1
+        return iqr_count, z_count
+
+
+def outlier_counts(values: np.ndarray, lower: float, upper: float,
+                   mean: float, max_deviation: float) -> Tuple[int, int]:
+    """
+    Count IQR-fence and z-score outliers in one pass.
+
+    Args:
+        values (np.ndarray): Non-missing acceleration values
+        lower (float): Lower IQR fence
+        upper (float): Upper IQR fence
+        mean (float): Mean of `values`
+        max_deviation (float): Largest |value - mean| not counted as a z-score outlier
+
+    Returns:
+        Tuple: (iqr_outliers, zscore_outliers) sample counts
+    """
+    if NUMBA_AVAILABLE:
+        counts = _outlier_counts_numba(values, lower, upper, mean, max_deviation)
+        return tuple(int(count) for count in counts)
+    return _outlier_counts_numpy(values, lower, upper, mean, max_deviation)
+
+
+def _integrity_counts_numpy(acc: np.ndarray, high_threshold: float,
+                            low_threshold: float) -> Tuple[int, int, int, int]:
+    """Zero, negative, too-high and too-low sample counts via separate NumPy reductions."""
+    return (int(np.count_nonzero(acc == 0)),
+            int(np.count_nonzero(acc < 0)),
+            int(np.count_nonzero(acc > high_threshold)),
+            int(np.count_nonzero(acc < low_threshold)))
+
+
+if NUMBA_AVAILABLE:
+
+    # No fastmath: recordings may contain NaN, which must compare False everywhere.
+    # Branch-free accumulation lets the loop vectorize
+    @njit(parallel=True, cache=True)
+    def _integrity_counts_numba(acc, high_threshold, low_threshold):
+        zeros = 0
+        negatives = 0
+        too_high = 0
+        too_low = 0
+        for i in prange(acc.shape[0]):
+            value = acc[i]
+            zeros += value == 0
+            negatives += value < 0
+            too_high += value > high_threshold
+            too_low += value < low_threshold
+        return zeros, negatives, too_high, too_low
+
+
+def integrity_counts(acc: np.ndarray, high_threshold: float,
+                     low_threshold: float) -> Tuple[int, int, int, int]:
+    """
+    Count the value-range anomalies of a recording in one pass.
+
+    Args:
+        acc (np.ndarray): Acceleration per sample (NaN compares False everywhere)
+        high_threshold (float): Values above this count as too high
+        low_threshold (float): Values below this (negative) threshold count as too low
+
+    Returns:
+        Tuple: (zeros, negatives, too_high, too_low) sample counts
+    """
+    if NUMBA_AVAILABLE:
+        counts = _integrity_counts_numba(acc, float(high_threshold), float(low_threshold))
+        return tuple(int(count) for count in counts)
+    return _integrity_counts_numpy(acc, high_threshold, low_threshold)
+
+
+def _scan_sleep_segment_numpy(acc: np.ndarray, awakening_threshold: float,
+                              sleep_threshold: float) -> Tuple[np.ndarray, np.ndarray, int, float, float]:
+    """Awakening runs, sleep sample count and movement moments via separate NumPy passes."""
+    # Runs end on the first sample back at or below the threshold (or the last sample)
+    edges = np.flatnonzero(np.diff((acc > awakening_threshold).astype(np.int8), prepend=0, append=0))
+    starts = edges[0::2]
+    ends = np.minimum(edges[1::2], len(acc) - 1)
+
+    values = acc[~np.isnan(acc)].astype(np.float64)
+    mean = float(values.mean()) if len(values) else np.nan
+    std = float(values.std(ddof=1)) if len(values) > 1 else np.nan
+    return starts, ends, int(np.count_nonzero(acc <= sleep_threshold)), mean, std
+
+
+if NUMBA_AVAILABLE:
+
+    # No fastmath: NaN samples must be skipped and compare False against both thresholds
+    @njit(cache=True)
+    def _scan_sleep_segment_numba(acc, awakening_threshold, sleep_threshold):
+        n = acc.shape[0]
+        # Runs are separated by at least one sample
+        capacity = (n + 1) // 2 + 1
+        starts = np.empty(capacity, dtype=np.int64)
+        ends = np.empty(capacity, dtype=np.int64)
+
+        n_runs = 0
+        run_start = -1
+        sleep_samples = 0
+        count = 0
+        mean = 0.0
+        ssqdm = 0.0
+        for i in range(n):
+            value = acc[i]
+            if not np.isnan(value):
+                # Welford update of the movement moments
+                count += 1
+                delta = value - mean
+                mean += delta / count
+                ssqdm += delta * (value - mean)
+                if value <= sleep_threshold:
+                    sleep_samples += 1
+            if value > awakening_threshold:
+                if run_start < 0:
+                    run_start = i
+            elif run_start >= 0:
+                starts[n_runs] = run_start
+                ends[n_runs] = i
+                n_runs += 1
+                run_start = -1
+        if run_start >= 0:
+            starts[n_runs] = run_start
+            ends[n_runs] = n - 1
+            n_runs += 1
+
+        return starts[:n_runs], ends[:n_runs], sleep_samples, count, mean, ssqdm
+
+
+def scan_sleep_segment(acc: np.ndarray, awakening_threshold: float,
+                       sleep_threshold: float) -> Tuple[np.ndarray, np.ndarray, int, float, float]:
+    """
+    Awakening runs, sleep sample count and movement statistics of a sleep segment in one pass.
+
+    Args:
+        acc (np.ndarray): Acceleration per sample of the segment (NaN values are skipped)
+        awakening_threshold (float): Samples above this belong to an awakening run
+        sleep_threshold (float): Samples at or below this count as actual sleep
+
+    Returns:
+        Tuple: (starts, ends, sleep_samples, mean, std). Each awakening run spans the
+        inclusive positions [start, end], where end is the first sample after the run
+        (or the last sample of the segment); std has ddof=1. mean and std are NaN
+        without enough valid samples
+    """
+    if NUMBA_AVAILABLE:
+        starts, ends, sleep_samples, count, mean, ssqdm = _scan_sleep_segment_numba(
+            acc, float(awakening_threshold), float(sleep_threshold)
+        )
+        std = np.sqrt(max(ssqdm, 0.0) / (count - 1)) if count > 1 else np.nan
+        return starts, ends, int(sleep_samples), float(mean) if count else np.nan, float(std)
+    return _scan_sleep_segment_numpy(acc, awakening_threshold, sleep_threshold)
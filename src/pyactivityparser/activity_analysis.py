@@ -6,11 +6,20 @@ Provides detailed physical activity pattern analysis.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional
+from typing import Dict, Optional
 import logging
 
+from ._kernels import calendar_histograms, find_bouts, widen_float32
+
 logger = logging.getLogger(__name__)
 
+# Intensity labels indexed by intensity code; unclassified samples appear as 'unknown' in transitions
+INTENSITY_LABELS = ('sedentary', 'light', 'moderate', 'vigorous')
+TRANSITION_LABELS = INTENSITY_LABELS + ('unknown',)
+
+# Day names indexed by pandas dayofweek (0 = Monday)
+WEEKDAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
 
 class ActivityAnalysis:
     """
@@ -30,6 +39,12 @@ class ActivityAnalysis:
             'vigorous': 100
         }
         
+        # Sorted intensity bin edges (light, moderate, vigorous) for classification
+        self._threshold_edges = np.array(
+            [self.thresholds['light'], self.thresholds['moderate'], self.thresholds['vigorous']],
+            dtype=np.float32
+        )
+        
         # Bout detection parameters
         self.bout_criteria = {
             'min_bout_duration_minutes': 10,
@@ -49,24 +64,50 @@ class ActivityAnalysis:
         """
         logger.info("Starting activity pattern analysis")
         
-        # Filter to wear time only
+        # Filter to wear time only; this is the single working frame for all analyses
         wear_data = data[data['wear_status']].copy()
         
         if len(wear_data) == 0:
             logger.warning("No wear time data available for activity analysis")
             return {}
         
+        # Parse timestamps once and attach the calendar fields used by hourly/weekly analyses
+        if 'timestamp' in wear_data.columns:
+            if not pd.api.types.is_datetime64_any_dtype(wear_data['timestamp']):
+                # Explicit format (as written by the data loader) skips per-value format inference
+                wear_data['timestamp'] = pd.to_datetime(wear_data['timestamp'], format='%Y-%m-%d %H:%M:%S',
+                                                        cache=True)
+            wear_data['hour'] = wear_data['timestamp'].dt.hour.astype(np.int8)
+            wear_data['dow'] = wear_data['timestamp'].dt.dayofweek.astype(np.int8)
+        
+        # Single precision is ample for mg magnitudes and halves the bytes every reduction reads
+        wear_data['acceleration'] = wear_data['acceleration'].astype(np.float32, copy=False)
+        
         # Activity classification
         activity_classification = self._classify_activity_intensity(wear_data)
         
+        # Samples per intensity level, shared by the summary metrics
+        codes = activity_classification['intensity_code'].to_numpy()
+        intensity_counts = np.bincount(codes[codes >= 0], minlength=4)
+        
         # Bout detection
-        activity_bouts = self._detect_activity_bouts(wear_data, activity_classification)
+        activity_bouts = self._detect_activity_bouts(activity_classification)
+        
+        # Hour-of-day and day-of-week tables in one fused pass
+        calendar_tables = None
+        if 'timestamp' in activity_classification.columns:
+            calendar_tables = calendar_histograms(
+                activity_classification['hour'].to_numpy(),
+                activity_classification['dow'].to_numpy(),
+                codes,
+                activity_classification['acceleration'].to_numpy()
+            )
         
         # Hourly patterns
-        hourly_patterns = self._analyze_hourly_patterns(wear_data)
+        hourly_patterns = self._analyze_hourly_patterns(calendar_tables)
         
         # Weekly patterns (if data spans multiple days)
-        weekly_patterns = self._analyze_weekly_patterns(wear_data)
+        weekly_patterns = self._analyze_weekly_patterns(calendar_tables)
         
         # Activity transitions
         transitions = self._analyze_activity_transitions(activity_classification)
@@ -77,35 +118,27 @@ class ActivityAnalysis:
             'hourly_patterns': hourly_patterns,
             'weekly_patterns': weekly_patterns,
             'activity_transitions': transitions,
-            'summary_metrics': self._calculate_summary_metrics(activity_classification, activity_bouts)
+            'summary_metrics': self._calculate_summary_metrics(activity_classification, activity_bouts,
+                                                               intensity_counts)
         }
         
         logger.info("Activity pattern analysis completed")
         return results
     
     def _classify_activity_intensity(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Classify each data point by activity intensity."""
-        data = data.copy()
-        acc = data['acceleration']
-        
-        # Classify activity intensity
-        conditions = [
-            acc < self.thresholds['light'],
-            (acc >= self.thresholds['light']) & (acc < self.thresholds['moderate']),
-            (acc >= self.thresholds['moderate']) & (acc < self.thresholds['vigorous']),
-            acc >= self.thresholds['vigorous']
-        ]
+        """Classify each data point by activity intensity (adds columns to `data` in place)."""
+        acc = data['acceleration'].to_numpy()
         
-        choices = ['sedentary', 'light', 'moderate', 'vigorous']
-        data['activity_intensity'] = np.select(conditions, choices, default='unknown')
+        # Classify activity intensity in a single pass over the sorted thresholds
+        codes = np.searchsorted(self._threshold_edges, acc, side='right').astype(np.int8)
+        codes[np.isnan(acc)] = -1  # Missing samples cannot be classified
         
-        # Calculate intensity code for numerical analysis
-        intensity_codes = {'sedentary': 0, 'light': 1, 'moderate': 2, 'vigorous': 3}
-        data['intensity_code'] = data['activity_intensity'].map(intensity_codes)
+        # Only integer codes are stored; labels are attached when results are summarized
+        data['intensity_code'] = codes
         
         return data
     
-    def _detect_activity_bouts(self, data: pd.DataFrame, classified_data: pd.DataFrame) -> Dict:
+    def _detect_activity_bouts(self, classified_data: pd.DataFrame) -> Dict:
         """
         Detect sustained activity bouts.
         
@@ -114,92 +147,96 @@ class ActivityAnalysis:
         min_bout_samples = int(self.bout_criteria['min_bout_duration_minutes'] * 60 / self.sample_rate_seconds)
         
         bouts = {
-            'moderate_bouts': [],
-            'vigorous_bouts': [],
-            'mvpa_bouts': [],  # Moderate to vigorous physical activity
-            'sedentary_bouts': []
+            'moderate_bouts': {},
+            'vigorous_bouts': {},
+            'mvpa_bouts': {},  # Moderate to vigorous physical activity
+            'sedentary_bouts': {}
         }
         
+        # Extract the underlying arrays once for all four bout types
+        codes = classified_data['intensity_code'].to_numpy()
+        acc = classified_data['acceleration'].to_numpy()
+        timestamps = classified_data['timestamp'].to_numpy() if 'timestamp' in classified_data.columns else None
+        
         # Detect MVPA bouts (moderate + vigorous)
-        mvpa_mask = classified_data['intensity_code'] >= 2
-        bouts['mvpa_bouts'] = self._find_bouts(mvpa_mask, min_bout_samples, classified_data)
+        bouts['mvpa_bouts'] = self._find_bouts(codes >= 2, min_bout_samples, acc, timestamps)
         
         # Detect moderate intensity bouts
-        moderate_mask = classified_data['intensity_code'] == 2
-        bouts['moderate_bouts'] = self._find_bouts(moderate_mask, min_bout_samples, classified_data)
+        bouts['moderate_bouts'] = self._find_bouts(codes == 2, min_bout_samples, acc, timestamps)
         
         # Detect vigorous intensity bouts
-        vigorous_mask = classified_data['intensity_code'] == 3
-        bouts['vigorous_bouts'] = self._find_bouts(vigorous_mask, min_bout_samples, classified_data)
+        bouts['vigorous_bouts'] = self._find_bouts(codes == 3, min_bout_samples, acc, timestamps)
         
         # Detect sedentary bouts (longer threshold - 30 minutes)
         sedentary_min_samples = int(30 * 60 / self.sample_rate_seconds)
-        sedentary_mask = classified_data['intensity_code'] == 0
-        bouts['sedentary_bouts'] = self._find_bouts(sedentary_mask, sedentary_min_samples, classified_data)
+        bouts['sedentary_bouts'] = self._find_bouts(codes == 0, sedentary_min_samples, acc, timestamps)
         
         return bouts
     
-    def _find_bouts(self, activity_mask: pd.Series, min_samples: int, data: pd.DataFrame) -> List[Dict]:
-        """Find continuous bouts of activity meeting minimum duration."""
-        bouts = []
-        
-        # Find continuous periods
-        mask_diff = activity_mask.astype(int).diff()
-        starts = mask_diff[mask_diff == 1].index
-        ends = mask_diff[mask_diff == -1].index
-        
-        # Handle edge cases
-        if activity_mask.iloc[0]:
-            starts = [activity_mask.index[0]] + list(starts)
-        if activity_mask.iloc[-1]:
-            ends = list(ends) + [activity_mask.index[-1]]
-            
-        for start_idx, end_idx in zip(starts, ends):
-            bout_length = end_idx - start_idx + 1
-            
-            if bout_length >= min_samples:
-                bout_data = data.loc[start_idx:end_idx]
-                
-                bout = {
-                    'start_time': bout_data['timestamp'].iloc[0] if 'timestamp' in bout_data.columns else start_idx,
-                    'end_time': bout_data['timestamp'].iloc[-1] if 'timestamp' in bout_data.columns else end_idx,
-                    'duration_minutes': bout_length * self.sample_rate_seconds / 60,
-                    'mean_acceleration': float(bout_data['acceleration'].mean()),
-                    'max_acceleration': float(bout_data['acceleration'].max()),
-                    'sample_count': bout_length
-                }
-                
-                bouts.append(bout)
+    def _find_bouts(self, activity_mask: np.ndarray, min_samples: int, acc: np.ndarray,
+                    timestamps: Optional[np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Find continuous bouts of activity meeting minimum duration.
+        
+        Returns a dict of equal-length arrays with one entry per bout. Bout times are
+        int64 nanoseconds since the epoch ('start_time_ns'/'end_time_ns'), or sample
+        positions ('start_index'/'end_index') when no timestamps are available.
+        """
+        # Run-length encode the mask and reduce each qualifying run in one pass
+        starts, ends, means, maxes = find_bouts(activity_mask, acc, min_samples)
+        lengths = ends - starts
+        
+        if timestamps is not None:
+            bouts = {
+                'start_time_ns': timestamps[starts].astype('datetime64[ns]').view(np.int64),
+                'end_time_ns': timestamps[ends - 1].astype('datetime64[ns]').view(np.int64)
+            }
+        else:
+            bouts = {'start_index': starts, 'end_index': ends - 1}
+        
+        bouts.update({
+            'duration_minutes': lengths * self.sample_rate_seconds / 60,
+            'mean_acceleration': means,
+            'max_acceleration': widen_float32(maxes),  # Recorded decimals, not float32 rounding
+            'sample_count': lengths
+        })
         
         return bouts
     
-    def _analyze_hourly_patterns(self, data: pd.DataFrame) -> Dict:
+    def _analyze_hourly_patterns(self, calendar_tables: Optional[Dict]) -> Dict:
         """Analyze activity patterns by hour of day."""
-        if 'timestamp' not in data.columns:
+        if calendar_tables is None:
             return {}
-            
-        data_copy = data.copy()
-        data_copy['hour'] = pd.to_datetime(data_copy['timestamp']).dt.hour
+        
+        intensity_counts = calendar_tables['hour_counts']
+        sample_counts = intensity_counts.sum(axis=1)
+        valid_counts = sample_counts - intensity_counts[:, 4]  # Exclude missing acceleration
+        hour_max = widen_float32(calendar_tables['hour_max'])  # Recorded decimals of the float32 maxima
         
         hourly_stats = {}
         
-        for hour in range(24):
-            hour_data = data_copy[data_copy['hour'] == hour]
-            
-            if len(hour_data) > 0:
-                acc = hour_data['acceleration']
-                hourly_stats[hour] = {
-                    'sample_count': len(hour_data),
-                    'mean_acceleration': float(acc.mean()),
-                    'std_acceleration': float(acc.std()),
-                    'max_acceleration': float(acc.max()),
-                    'sedentary_percentage': float(((acc < self.thresholds['light']).sum() / len(acc)) * 100),
-                    'light_percentage': float((((acc >= self.thresholds['light']) & 
-                                             (acc < self.thresholds['moderate'])).sum() / len(acc)) * 100),
-                    'moderate_percentage': float((((acc >= self.thresholds['moderate']) & 
-                                                (acc < self.thresholds['vigorous'])).sum() / len(acc)) * 100),
-                    'vigorous_percentage': float(((acc >= self.thresholds['vigorous']).sum() / len(acc)) * 100)
-                }
+        for hour in np.flatnonzero(sample_counts):
+            hour = int(hour)
+            sample_count = sample_counts[hour]
+            valid_count = valid_counts[hour]
+            acc_sum = calendar_tables['hour_sum'][hour]
+            mean_acc = acc_sum / valid_count if valid_count > 0 else np.nan
+            if valid_count > 1:
+                variance = (calendar_tables['hour_sumsq'][hour] - acc_sum * mean_acc) / (valid_count - 1)
+                std_acc = np.sqrt(max(0.0, variance))
+            else:
+                std_acc = np.nan
+            counts = intensity_counts[hour]
+            hourly_stats[hour] = {
+                'sample_count': int(sample_count),
+                'mean_acceleration': float(mean_acc),
+                'std_acceleration': float(std_acc),
+                'max_acceleration': float(hour_max[hour]) if valid_count > 0 else np.nan,
+                'sedentary_percentage': float((counts[0] / sample_count) * 100),
+                'light_percentage': float((counts[1] / sample_count) * 100),
+                'moderate_percentage': float((counts[2] / sample_count) * 100),
+                'vigorous_percentage': float((counts[3] / sample_count) * 100)
+            }
         
         # Find peak activity hours
         if hourly_stats:
@@ -218,26 +255,25 @@ class ActivityAnalysis:
             
         return summary
     
-    def _analyze_weekly_patterns(self, data: pd.DataFrame) -> Dict:
+    def _analyze_weekly_patterns(self, calendar_tables: Optional[Dict]) -> Dict:
         """Analyze activity patterns by day of week."""
-        if 'timestamp' not in data.columns:
+        if calendar_tables is None:
             return {}
-            
-        data_copy = data.copy()
-        data_copy['weekday'] = pd.to_datetime(data_copy['timestamp']).dt.day_name()
+        
+        intensity_counts = calendar_tables['dow_counts']
+        sample_counts = intensity_counts.sum(axis=1)
+        valid_counts = sample_counts - intensity_counts[:, 4]  # Exclude missing acceleration
+        acc_sums = calendar_tables['dow_sum']
+        mvpa_counts = intensity_counts[:, 2] + intensity_counts[:, 3]
         
         weekly_stats = {}
         
-        for day in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']:
-            day_data = data_copy[data_copy['weekday'] == day]
-            
-            if len(day_data) > 0:
-                acc = day_data['acceleration']
+        for dow, day in enumerate(WEEKDAY_NAMES):
+            if sample_counts[dow] > 0:
                 weekly_stats[day] = {
-                    'sample_count': len(day_data),
-                    'mean_acceleration': float(acc.mean()),
-                    'total_mvpa_minutes': float(((acc >= self.thresholds['moderate']).sum() * 
-                                               self.sample_rate_seconds) / 60)
+                    'sample_count': int(sample_counts[dow]),
+                    'mean_acceleration': float(acc_sums[dow] / valid_counts[dow]) if valid_counts[dow] > 0 else float('nan'),
+                    'total_mvpa_minutes': float((mvpa_counts[dow] * self.sample_rate_seconds) / 60)
                 }
         
         return weekly_stats
@@ -251,63 +287,63 @@ class ActivityAnalysis:
             'activity_resumptions': 0
         }
         
-        intensity_sequence = classified_data['activity_intensity']
+        # Integer codes allow arithmetic keying; unclassified samples (-1) get code 4
+        codes = classified_data['intensity_code'].to_numpy().astype(np.int64)
+        codes[codes < 0] = 4
         
-        # Count transitions
-        for i in range(1, len(intensity_sequence)):
-            prev_activity = intensity_sequence.iloc[i-1]
-            curr_activity = intensity_sequence.iloc[i]
-            
-            if prev_activity != curr_activity:
-                transitions['total_transitions'] += 1
-                
-                # Build transition matrix
-                key = f"{prev_activity}_to_{curr_activity}"
-                transitions['transition_matrix'][key] = transitions['transition_matrix'].get(key, 0) + 1
-                
-                # Count specific transition types
-                if prev_activity == 'sedentary' and curr_activity != 'sedentary':
-                    transitions['sedentary_breaks'] += 1
-                elif prev_activity != 'sedentary' and curr_activity == 'sedentary':
-                    transitions['activity_resumptions'] += 1
+        # Count transitions between consecutive samples
+        prev_codes = codes[:-1]
+        curr_codes = codes[1:]
+        changed = prev_codes != curr_codes
+        transitions['total_transitions'] = int(changed.sum())
+        
+        # Build transition matrix
+        keys, counts = np.unique(prev_codes[changed] * 5 + curr_codes[changed], return_counts=True)
+        for key, count in zip(keys, counts):
+            transition = f"{TRANSITION_LABELS[key // 5]}_to_{TRANSITION_LABELS[key % 5]}"
+            transitions['transition_matrix'][transition] = int(count)
+        
+        # Count specific transition types
+        transitions['sedentary_breaks'] = int(((prev_codes == 0) & (curr_codes != 0)).sum())
+        transitions['activity_resumptions'] = int(((prev_codes != 0) & (curr_codes == 0)).sum())
         
         # Calculate transition rates (per hour)
-        total_time_hours = len(intensity_sequence) * self.sample_rate_seconds / 3600
+        total_time_hours = len(codes) * self.sample_rate_seconds / 3600
         if total_time_hours > 0:
             transitions['transitions_per_hour'] = transitions['total_transitions'] / total_time_hours
             transitions['sedentary_breaks_per_hour'] = transitions['sedentary_breaks'] / total_time_hours
         
         return transitions
     
-    def _calculate_summary_metrics(self, classified_data: pd.DataFrame, activity_bouts: Dict) -> Dict:
+    def _calculate_summary_metrics(self, classified_data: pd.DataFrame, activity_bouts: Dict,
+                                   intensity_counts: np.ndarray) -> Dict:
         """Calculate summary metrics for activity analysis."""
         summary = {}
         
         # Overall activity distribution
-        intensity_counts = classified_data['activity_intensity'].value_counts()
         total_samples = len(classified_data)
         
-        for intensity in ['sedentary', 'light', 'moderate', 'vigorous']:
-            count = intensity_counts.get(intensity, 0)
+        for code, intensity in enumerate(INTENSITY_LABELS):
+            count = intensity_counts[code]
             summary[f'{intensity}_percentage'] = float((count / total_samples) * 100)
             summary[f'{intensity}_minutes'] = float((count * self.sample_rate_seconds) / 60)
         
         # MVPA metrics
-        mvpa_samples = intensity_counts.get('moderate', 0) + intensity_counts.get('vigorous', 0)
+        mvpa_samples = intensity_counts[2] + intensity_counts[3]
         summary['mvpa_percentage'] = float((mvpa_samples / total_samples) * 100)
         summary['mvpa_minutes'] = float((mvpa_samples * self.sample_rate_seconds) / 60)
         
         # Bout metrics
-        summary['mvpa_bout_count'] = len(activity_bouts.get('mvpa_bouts', []))
-        summary['total_mvpa_bout_minutes'] = sum(bout['duration_minutes'] 
-                                               for bout in activity_bouts.get('mvpa_bouts', []))
+        mvpa_bouts = activity_bouts['mvpa_bouts']
+        summary['mvpa_bout_count'] = int(mvpa_bouts['duration_minutes'].size)
+        summary['total_mvpa_bout_minutes'] = float(mvpa_bouts['duration_minutes'].sum())
         summary['average_mvpa_bout_duration'] = (summary['total_mvpa_bout_minutes'] / 
                                                summary['mvpa_bout_count'] 
                                                if summary['mvpa_bout_count'] > 0 else 0)
         
-        summary['sedentary_bout_count'] = len(activity_bouts.get('sedentary_bouts', []))
-        summary['total_sedentary_bout_minutes'] = sum(bout['duration_minutes'] 
-                                                    for bout in activity_bouts.get('sedentary_bouts', []))
+        sedentary_bouts = activity_bouts['sedentary_bouts']
+        summary['sedentary_bout_count'] = int(sedentary_bouts['duration_minutes'].size)
+        summary['total_sedentary_bout_minutes'] = float(sedentary_bouts['duration_minutes'].sum())
         summary['average_sedentary_bout_duration'] = (summary['total_sedentary_bout_minutes'] / 
                                                      summary['sedentary_bout_count'] 
                                                      if summary['sedentary_bout_count'] > 0 else 0)
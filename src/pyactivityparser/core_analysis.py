@@ -10,8 +10,14 @@ from typing import Dict, List, Optional, Tuple
 import logging
 from datetime import datetime, timedelta
 
+from ._kernels import (count_spaced_peaks, quality_counts, rolling_mean_std, rolling_std_threshold,
+                       widen_float32)
+
 logger = logging.getLogger(__name__)
 
+# Activity level bin edges (mg): sedentary < 5 <= light < 40 <= moderate <= 100 < high
+ACTIVITY_BIN_EDGES = np.array([5.0, 40.0, np.nextafter(100.0, np.inf)])
+
 
 class CoreAnalysis:
     """
@@ -20,8 +26,13 @@ class CoreAnalysis:
     Inspired by ActivityParser Parts 1-2: data processing and basic quality assessment.
     """
     
-    def __init__(self, sample_rate_seconds: int = 5):
+    def __init__(self, sample_rate_seconds: int = 5, keep_rolling_series: bool = False):
         self.sample_rate_seconds = sample_rate_seconds
+        self.keep_rolling_series = keep_rolling_series
+        # Window lengths in samples depend only on the sampling rate
+        self._win_5min = max(1, 300 // sample_rate_seconds)
+        self._win_30min = max(1, 1800 // sample_rate_seconds)
+        self._min_step_interval = max(1, int(0.5 / sample_rate_seconds))  # 0.5 seconds minimum between steps
         self.data = None
         self.results = {}
         
@@ -30,7 +41,8 @@ class CoreAnalysis:
         Process accelerometer data through core analysis pipeline.
         
         Args:
-            data (pd.DataFrame): Accelerometer data with columns [timestamp, acceleration, imputed]
+            data (pd.DataFrame): Accelerometer data with columns [acceleration, imputed] and
+                optionally timestamp (otherwise derived from metadata start_time/sample_rate_seconds)
             metadata (Dict): Metadata about the data
             
         Returns:
@@ -38,7 +50,30 @@ class CoreAnalysis:
         """
         logger.info("Starting core data analysis")
         
-        self.data = data.copy()
+        # Column arrays (views where the dtype already matches) instead of a full frame copy;
+        # readings are low precision, so float32 halves the memory each pass moves. An empty
+        # imputed field reads as NaN, which a bool cast would count as imputed
+        self._acc = data['acceleration'].to_numpy(dtype=np.float32, copy=False)
+        self._imp = data['imputed'].fillna(0).to_numpy(dtype=np.bool_, copy=False)
+        if 'timestamp' in data.columns:
+            self._ts = data['timestamp'].to_numpy()
+        elif 'start_time' in metadata:
+            # The loader keeps no timestamp column; sampling is regular, so rebuild it once here
+            # (cast to ns rather than date_range(unit=...), which needs pandas >= 2.0)
+            self._ts = pd.date_range(
+                metadata['start_time'], periods=len(self._acc),
+                freq=pd.Timedelta(seconds=metadata.get('sample_rate_seconds', self.sample_rate_seconds))
+            ).astype('datetime64[ns]').to_numpy()
+        else:
+            self._ts = None
+        self._has_ts = self._ts is not None
+        self._day = None
+        if self._has_ts:
+            if not np.issubdtype(self._ts.dtype, np.datetime64):
+                self._ts = pd.to_datetime(self._ts).to_numpy()
+            # Calendar day as native datetime64 (groups far faster than datetime.date objects)
+            self._day = self._ts.astype('datetime64[D]')
+        self._wear = None
         self.metadata = metadata
         
         # Step 1: Calculate basic metrics
@@ -46,181 +81,215 @@ class CoreAnalysis:
         
         # Step 2: Detect wear/non-wear periods
         wear_detection = self._detect_wear_periods()
+        self._acc_wear = self._acc[self._wear]  # compact wear-time samples, reused by later steps
         
-        # Step 3: Calculate daily summaries
-        daily_summaries = self._calculate_daily_summaries()
+        # Step 3: Calculate daily summaries (calendar days need timestamps)
+        if self._has_ts:
+            daily_columns = self._calculate_daily_summaries()
+            daily_summaries = self._summaries_as_records(daily_columns)
+        else:
+            daily_columns = {}
+            daily_summaries = []
         
         # Step 4: Calculate activity intensity levels
         activity_levels = self._calculate_activity_levels()
         
-        # Step 5: Quality assessment
-        quality_metrics = self._assess_data_quality()
+        # Step 5: Quality assessment (reuses the daily summaries from step 3)
+        quality_metrics = self._assess_data_quality(daily_columns)
         
         self.results = {
             'basic_metrics': basic_metrics,
             'wear_detection': wear_detection,
             'daily_summaries': daily_summaries,
+            'daily_summaries_soa': daily_columns,
             'activity_levels': activity_levels,
             'quality_metrics': quality_metrics,
-            'processed_data': self.data
+            'processed_data': self._build_processed_data(data.index)
         }
+        self.data = self.results['processed_data']
         
         logger.info("Core analysis completed")
         return self.results
     
+    def _build_processed_data(self, index: pd.Index) -> pd.DataFrame:
+        """Wrap the column arrays and wear status into a DataFrame for downstream modules."""
+        columns = {}
+        if self._has_ts:
+            columns['timestamp'] = self._ts
+        columns['acceleration'] = self._acc
+        columns['imputed'] = self._imp
+        columns['wear_status'] = self._wear
+        if self._day is not None:
+            columns['date'] = self._day
+        return pd.DataFrame(columns, index=index, copy=False)
+    
     def _calculate_basic_metrics(self) -> Dict:
         """Calculate basic acceleration metrics."""
         metrics = {}
         
-        # Convert mg to g for calculations
-        acc_g = self.data['acceleration'] / 1000.0
+        # Reduce the float32 mg samples in float64; order statistics are widened to the
+        # recorded decimals before the conversion to g, so no float32 rounding is reported
+        acc_mg = pd.Series(self._acc, dtype=np.float64)
         
         # Basic statistics
-        metrics['mean_acceleration'] = float(acc_g.mean())
-        metrics['std_acceleration'] = float(acc_g.std())
-        metrics['min_acceleration'] = float(acc_g.min())
-        metrics['max_acceleration'] = float(acc_g.max())
-        metrics['median_acceleration'] = float(acc_g.median())
+        metrics['mean_acceleration'] = float(acc_mg.mean()) / 1000.0
+        metrics['std_acceleration'] = float(acc_mg.std()) / 1000.0
+        metrics['min_acceleration'] = float(widen_float32(acc_mg.min())) / 1000.0
+        metrics['max_acceleration'] = float(widen_float32(acc_mg.max())) / 1000.0
+        metrics['median_acceleration'] = float(widen_float32(acc_mg.median())) / 1000.0
         
         # Calculate additional metrics inspired by ActivityParser
-        # Moving averages (5-minute windows)
-        window_size = max(1, 300 // self.sample_rate_seconds)  # 5 minutes
-        metrics['rolling_mean_5min'] = acc_g.rolling(window=window_size, min_periods=1).mean()
-        metrics['rolling_std_5min'] = acc_g.rolling(window=window_size, min_periods=1).std()
+        # Moving averages (5-minute windows), full-length so only kept on request
+        if self.keep_rolling_series:
+            rolling_mean, rolling_std = rolling_mean_std(self._acc, self._win_5min)
+            metrics['rolling_mean_5min'] = pd.Series(rolling_mean / 1000.0)
+            metrics['rolling_std_5min'] = pd.Series(rolling_std / 1000.0)
         
         # Activity counts (simplified version of ActivityParser's approach)
         # High activity: > 100mg
         # Moderate activity: 40-100mg  
         # Light activity: 5-40mg
         # Sedentary: < 5mg
-        acc_mg = self.data['acceleration']
-        metrics['high_activity_count'] = (acc_mg > 100).sum()
-        metrics['moderate_activity_count'] = ((acc_mg >= 40) & (acc_mg <= 100)).sum()
-        metrics['light_activity_count'] = ((acc_mg >= 5) & (acc_mg < 40)).sum()
-        metrics['sedentary_count'] = (acc_mg < 5).sum()
+        sedentary, light, moderate, high = self._activity_bin_counts(self._acc)
+        metrics['high_activity_count'] = high
+        metrics['moderate_activity_count'] = moderate
+        metrics['light_activity_count'] = light
+        metrics['sedentary_count'] = sedentary
         
         return metrics
     
+    def _activity_bin_counts(self, acc_mg: np.ndarray) -> List[int]:
+        """Count samples per activity level [sedentary, light, moderate, high] in one pass."""
+        counts = np.bincount(np.searchsorted(ACTIVITY_BIN_EDGES, acc_mg, side='right'), minlength=4)
+        # NaN sorts past every edge; missing samples belong to no activity level
+        counts[3] -= np.count_nonzero(np.isnan(acc_mg))
+        # Python ints here, so the metrics dicts serialize without per-field numpy conversions
+        return counts.tolist()
+    
     def _detect_wear_periods(self) -> Dict:
         """
         Detect wear and non-wear periods.
         
         Based on consecutive periods of low/zero acceleration.
         """
-        # Simple wear detection: periods with very low variance may indicate non-wear
-        window_size = max(1, 1800 // self.sample_rate_seconds)  # 30 minutes
-        
-        rolling_std = self.data['acceleration'].rolling(
-            window=window_size, min_periods=1
-        ).std().fillna(0)
-        
+        # Simple wear detection: periods with very low variance (over 30 minutes) may indicate non-wear
         # Non-wear threshold: very low standard deviation
         non_wear_threshold = 1.0  # mg
-        non_wear_periods = rolling_std < non_wear_threshold
         
-        # Mark wear status
-        self.data['wear_status'] = ~non_wear_periods
+        # Mark wear status (rolling std and threshold comparison in one pass)
+        self._wear = np.empty(self._acc.size, dtype=bool)
+        rolling_std_threshold(self._acc, self._win_30min, non_wear_threshold, self._wear)
+        self._wear_count = int(self._wear.sum())
+        self._n = self._wear.size
         
         wear_stats = {
-            'total_wear_time_hours': float(self.data['wear_status'].sum() * self.sample_rate_seconds / 3600),
-            'total_non_wear_time_hours': float((~self.data['wear_status']).sum() * self.sample_rate_seconds / 3600),
-            'wear_percentage': float(self.data['wear_status'].mean() * 100),
-            'non_wear_periods': self._identify_continuous_periods(~self.data['wear_status'])
+            'total_wear_time_hours': float(self._wear_count * self.sample_rate_seconds / 3600),
+            'total_non_wear_time_hours': float((self._n - self._wear_count) * self.sample_rate_seconds / 3600),
+            'wear_percentage': float(self._wear_count / self._n * 100),
+            'non_wear_periods': self._identify_continuous_periods(~self._wear)
         }
         
         return wear_stats
     
-    def _identify_continuous_periods(self, mask: pd.Series) -> List[Dict]:
+    def _identify_continuous_periods(self, mask: np.ndarray) -> List[Dict]:
         """Identify continuous periods where mask is True."""
-        periods = []
-        if mask.sum() == 0:
-            return periods
-            
-        # Find start and end of continuous periods
-        mask_diff = mask.astype(int).diff()
-        starts = mask_diff[mask_diff == 1].index
-        ends = mask_diff[mask_diff == -1].index
-        
-        # Handle edge cases
-        if mask.iloc[0]:
-            starts = [mask.index[0]] + list(starts)
-        if mask.iloc[-1]:
-            ends = list(ends) + [mask.index[-1]]
-            
-        for start_idx, end_idx in zip(starts, ends):
-            start_time = self.data.loc[start_idx, 'timestamp'] if 'timestamp' in self.data.columns else start_idx
-            end_time = self.data.loc[end_idx, 'timestamp'] if 'timestamp' in self.data.columns else end_idx
-            duration_minutes = (end_idx - start_idx + 1) * self.sample_rate_seconds / 60
-            
-            periods.append({
-                'start_time': start_time,
-                'end_time': end_time,
-                'duration_minutes': duration_minutes
-            })
-            
-        return periods
+        # Rising edges are starts, falling edges are (exclusive) ends
+        m = np.asarray(mask, dtype=np.int8)
+        edges = np.flatnonzero(np.diff(m, prepend=0, append=0))
+        starts = edges[0::2]
+        ends = edges[1::2]
+        
+        if self._has_ts:
+            start_times = pd.to_datetime(self._ts[starts])
+            end_times = pd.to_datetime(self._ts[ends - 1])
+        else:
+            start_times = starts.tolist()
+            end_times = (ends - 1).tolist()
+        durations = ((ends - starts) * self.sample_rate_seconds / 60).tolist()
+        
+        return [
+            {'start_time': start_time, 'end_time': end_time, 'duration_minutes': duration}
+            for start_time, end_time, duration in zip(start_times, end_times, durations)
+        ]
     
-    def _calculate_daily_summaries(self) -> List[Dict]:
-        """Calculate daily summary statistics."""
-        if 'timestamp' not in self.data.columns:
+    def _calculate_daily_summaries(self) -> Dict[str, np.ndarray]:
+        """Calculate daily summary statistics as one array per field (one entry per worn day)."""
+        # Activity level per wear sample (-1 for non-wear and missing samples)
+        bins = np.searchsorted(ACTIVITY_BIN_EDGES, self._acc, side='right')
+        bins[~self._wear | np.isnan(self._acc)] = -1
+        
+        # Group data by date (wear acceleration in float64, so the per-day means are not
+        # rounded back to float32)
+        day_frame = pd.DataFrame({
+            'date': self._day,
+            'wear_acceleration': np.where(self._wear, self._acc.astype(np.float64), np.nan),
+            'imputed': self._imp,
+            'wear_status': self._wear,
+            'bin': bins
+        }, copy=False)
+        grouped = day_frame.groupby('date')
+        
+        days = grouped.agg(
+            total_samples=('wear_status', 'size'),
+            wear_samples=('wear_status', 'sum'),
+            mean_acceleration=('wear_acceleration', 'mean'),
+            max_acceleration=('wear_acceleration', 'max'),
+            imputed_samples=('imputed', 'sum')
+        )
+        bin_minutes = grouped['bin'].value_counts().unstack(fill_value=0).reindex(
+            columns=range(4), fill_value=0
+        ) * self.sample_rate_seconds / 60
+        days = days.join(bin_minutes)[days['wear_samples'] > 0]
+        
+        total_samples = days['total_samples'].to_numpy()
+        wear_samples = days['wear_samples'].to_numpy()
+        return {
+            'date': days.index.to_numpy().astype('datetime64[D]'),
+            'total_samples': total_samples,
+            'wear_samples': wear_samples,
+            'wear_time_hours': wear_samples * self.sample_rate_seconds / 3600,
+            'mean_acceleration': days['mean_acceleration'].to_numpy(),
+            'max_acceleration': widen_float32(days['max_acceleration'].to_numpy()),
+            'imputed_samples': days['imputed_samples'].to_numpy(),
+            'data_completeness': wear_samples / total_samples,
+            'high_activity_minutes': days[3].to_numpy(),
+            'moderate_activity_minutes': days[2].to_numpy(),
+            'light_activity_minutes': days[1].to_numpy(),
+            'sedentary_minutes': days[0].to_numpy()
+        }
+    
+    def _summaries_as_records(self, daily_columns: Dict[str, np.ndarray]) -> List[Dict]:
+        """Materialize the per-day dict view of columnar daily summaries for list-based consumers."""
+        if not daily_columns:
             return []
-            
-        daily_summaries = []
-        
-        # Group data by date
-        self.data['date'] = pd.to_datetime(self.data['timestamp']).dt.date
-        
-        for date, day_data in self.data.groupby('date'):
-            wear_data = day_data[day_data['wear_status']]
-            
-            if len(wear_data) == 0:
-                continue
-                
-            summary = {
-                'date': date,
-                'total_samples': len(day_data),
-                'wear_samples': len(wear_data),
-                'wear_time_hours': len(wear_data) * self.sample_rate_seconds / 3600,
-                'mean_acceleration': float(wear_data['acceleration'].mean()),
-                'max_acceleration': float(wear_data['acceleration'].max()),
-                'imputed_samples': int(day_data['imputed'].sum()),
-                'data_completeness': len(wear_data) / len(day_data) if len(day_data) > 0 else 0
-            }
-            
-            # Activity level breakdown for the day
-            acc = wear_data['acceleration']
-            summary['high_activity_minutes'] = ((acc > 100).sum() * self.sample_rate_seconds) / 60
-            summary['moderate_activity_minutes'] = (((acc >= 40) & (acc <= 100)).sum() * self.sample_rate_seconds) / 60
-            summary['light_activity_minutes'] = (((acc >= 5) & (acc < 40)).sum() * self.sample_rate_seconds) / 60
-            summary['sedentary_minutes'] = ((acc < 5).sum() * self.sample_rate_seconds) / 60
-            
-            daily_summaries.append(summary)
-            
-        return daily_summaries
+        # tolist() yields native ints/floats and datetime.date values
+        names = list(daily_columns)
+        columns = [daily_columns[name].tolist() for name in names]
+        return [dict(zip(names, row)) for row in zip(*columns)]
     
     def _calculate_activity_levels(self) -> Dict:
         """Calculate overall activity level metrics."""
-        wear_data = self.data[self.data['wear_status']]
+        wear_acc = self._acc_wear
         
-        if len(wear_data) == 0:
+        if len(wear_acc) == 0:
             return {}
             
-        acc = wear_data['acceleration']
-        total_wear_time_minutes = len(wear_data) * self.sample_rate_seconds / 60
+        sedentary, light, moderate, high = self._activity_bin_counts(wear_acc)
+        total_wear_time_minutes = len(wear_acc) * self.sample_rate_seconds / 60
         
         activity_levels = {
             'total_wear_time_minutes': total_wear_time_minutes,
-            'high_activity_percentage': float(((acc > 100).sum() / len(wear_data)) * 100),
-            'moderate_activity_percentage': float((((acc >= 40) & (acc <= 100)).sum() / len(wear_data)) * 100),
-            'light_activity_percentage': float((((acc >= 5) & (acc < 40)).sum() / len(wear_data)) * 100),
-            'sedentary_percentage': float(((acc < 5).sum() / len(wear_data)) * 100),
-            'mvpa_minutes': float(((acc >= 40).sum() * self.sample_rate_seconds) / 60),  # Moderate-to-vigorous physical activity
-            'average_daily_steps_estimate': self._estimate_daily_steps(wear_data)
+            'high_activity_percentage': float((high / len(wear_acc)) * 100),
+            'moderate_activity_percentage': float((moderate / len(wear_acc)) * 100),
+            'light_activity_percentage': float((light / len(wear_acc)) * 100),
+            'sedentary_percentage': float((sedentary / len(wear_acc)) * 100),
+            'mvpa_minutes': float(((moderate + high) * self.sample_rate_seconds) / 60),  # Moderate-to-vigorous physical activity
+            'average_daily_steps_estimate': self._estimate_daily_steps(wear_acc)
         }
         
         return activity_levels
     
-    def _estimate_daily_steps(self, wear_data: pd.DataFrame) -> float:
+    def _estimate_daily_steps(self, acc: np.ndarray) -> float:
         """
         Rough estimate of daily steps based on acceleration patterns.
         
@@ -229,41 +298,37 @@ class CoreAnalysis:
         """
         # Simple step estimation based on acceleration peaks
         # This is a very rough approximation
-        acc = wear_data['acceleration']
-        
         # Look for acceleration peaks that might indicate steps
         # Threshold and spacing based on typical walking patterns
         threshold = 50  # mg
-        min_step_interval = max(1, int(0.5 / self.sample_rate_seconds))  # 0.5 seconds minimum between steps
-        
-        peaks = []
-        last_peak_idx = -min_step_interval
         
-        for i, value in enumerate(acc):
-            if value > threshold and (i - last_peak_idx) >= min_step_interval:
-                peaks.append(i)
-                last_peak_idx = i
+        # Candidate samples in one vectorized pass; spacing is enforced over the sparse candidates only
+        candidates = np.flatnonzero(acc > threshold)
+        peak_count = count_spaced_peaks(candidates, self._min_step_interval)
         
         # Estimate daily steps (very rough)
-        total_wear_time_hours = len(wear_data) * self.sample_rate_seconds / 3600
+        total_wear_time_hours = len(acc) * self.sample_rate_seconds / 3600
         if total_wear_time_hours > 0:
-            steps_per_hour = len(peaks) / total_wear_time_hours
+            steps_per_hour = peak_count / total_wear_time_hours
             estimated_daily_steps = steps_per_hour * 16  # Assume 16 hours of activity per day
         else:
             estimated_daily_steps = 0
             
         return float(estimated_daily_steps)
     
-    def _assess_data_quality(self) -> Dict:
+    def _assess_data_quality(self, daily_columns: Dict[str, np.ndarray]) -> Dict:
         """Assess overall data quality."""
+        # Values > 1g might be outliers
+        missing, zeros, outliers, imputed = quality_counts(self._acc, self._imp, 1000.0)
+        
         quality_metrics = {
-            'total_recording_hours': len(self.data) * self.sample_rate_seconds / 3600,
-            'data_completeness_percentage': float((1 - self.data['acceleration'].isna().sum() / len(self.data)) * 100),
-            'imputation_percentage': float((self.data['imputed'].sum() / len(self.data)) * 100),
-            'wear_compliance_percentage': float(self.data['wear_status'].mean() * 100),
-            'valid_days': len([d for d in self._calculate_daily_summaries() if d['wear_time_hours'] >= 10]),  # Days with ≥10h wear time
-            'outlier_count': int((self.data['acceleration'] > 1000).sum()),  # Values > 1g might be outliers
-            'zero_values_count': int((self.data['acceleration'] == 0).sum())
+            'total_recording_hours': self._n * self.sample_rate_seconds / 3600,
+            'data_completeness_percentage': float((1 - missing / self._n) * 100),
+            'imputation_percentage': float((imputed / self._n) * 100),
+            'wear_compliance_percentage': float(self._wear_count / self._n * 100),
+            'valid_days': int(np.count_nonzero(daily_columns.get('wear_time_hours', np.empty(0)) >= 10)),  # Days with ≥10h wear time
+            'outlier_count': outliers,
+            'zero_values_count': zeros
         }
         
         # Overall quality score (0-100)
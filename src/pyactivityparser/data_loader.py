@@ -6,14 +6,28 @@ Handles loading and parsing of accelerometer data from CSV files.
 
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+import os
+from datetime import datetime
 import re
 from typing import Dict, Tuple, Optional
 import logging
 
-logging.basicConfig(level=logging.INFO)
+from ._kernels import widen_float32
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    PYARROW_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Header patterns, compiled once for all files
+_UNIT_RE = re.compile(r'acceleration \((\w+)\)')
+_TIME_RE = re.compile(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) - (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})')
+_RATE_RE = re.compile(r'sampleRate = (\d+) seconds')
+
 
 class AccelerometerDataLoader:
     """
@@ -29,6 +43,32 @@ class AccelerometerDataLoader:
         self.data = None
         self.participant_id = None
         
+        # Typed column views (SoA) over self.data for numeric consumers
+        self.raw_acceleration = None
+        self.raw_imputed = None
+        
+    @property
+    def timestamps(self) -> Optional[pd.DatetimeIndex]:
+        """
+        Sample timestamps, materialized on demand from the header start time and sample rate.
+        
+        Sampling is regular, so no timestamp column is stored with the data.
+        """
+        if self.data is None or 'start_time' not in self.metadata:
+            return None
+        # astype rather than date_range(unit=...), which needs pandas >= 2.0; nanosecond
+        # resolution keeps `raw_timestamps_ns` in ns where pandas defaults to microseconds
+        return pd.date_range(
+            self.metadata['start_time'], periods=len(self.data),
+            freq=pd.Timedelta(seconds=self.metadata['sample_rate_seconds'])
+        ).astype('datetime64[ns]')
+    
+    @property
+    def raw_timestamps_ns(self) -> Optional[np.ndarray]:
+        """Sample timestamps as int64 nanoseconds since the epoch (materialized on demand)."""
+        timestamps = self.timestamps
+        return timestamps.asi8 if timestamps is not None else None
+    
     def load_file(self, file_path: str) -> Dict:
         """
         Load accelerometer data from CSV file.
@@ -51,12 +91,9 @@ class AccelerometerDataLoader:
         # Parse header metadata
         self.metadata = self._parse_header(header_line)
         
-        # Load data
-        self.data = pd.read_csv(file_path, skiprows=1, header=None, 
-                               names=['acceleration', 'imputed'])
-        
-        # Add timestamp column
-        self.data = self._add_timestamps()
+        # Load data (timestamps are implied by start_time + i * sample_rate, see `timestamps`)
+        self.data = self._read_samples(file_path)
+        self._set_raw_arrays()
         
         # Validate data
         self._validate_data()
@@ -66,15 +103,66 @@ class AccelerometerDataLoader:
         return {
             'participant_id': self.participant_id,
             'metadata': self.metadata,
-            'data': self.data
+            'data': self.data,
+            'raw_acceleration': self.raw_acceleration,
+            'raw_imputed': self.raw_imputed
+        }
+    
+    def _set_raw_arrays(self) -> None:
+        """Expose the loaded columns as typed numpy arrays (views when dtypes already match)."""
+        self.raw_acceleration = self.data['acceleration'].to_numpy(dtype=np.float32, copy=False)
+        # Empty imputed fields load as NaN; count them as not imputed, as pandas' sum does
+        self.raw_imputed = self.data['imputed'].fillna(0).to_numpy(dtype=np.uint8, copy=False)
+    
+    def _read_samples(self, file_path: str) -> pd.DataFrame:
+        """
+        Read the sample rows with fixed numeric dtypes.
+        
+        Uses pyarrow's multithreaded CSV reader when it is installed, otherwise the pandas
+        C parser. Only empty fields are treated as missing (the export format has no other
+        NA markers), which keeps NA detection cheap; malformed rows fall back to type inference.
+        """
+        if PYARROW_AVAILABLE:
+            try:
+                return self._read_samples_arrow(file_path)
+            except pa.ArrowInvalid:
+                logger.warning(f"pyarrow could not parse {file_path}; retrying with pandas")
+        
+        read_options = {
+            'skiprows': 1,
+            'header': None,
+            'names': ['acceleration', 'imputed'],
+            'engine': 'c',
+            'memory_map': True,
+            'low_memory': False
         }
+        
+        try:
+            return pd.read_csv(file_path, dtype={'acceleration': np.float32, 'imputed': np.uint8},
+                               keep_default_na=False, na_values=[''], **read_options)
+        except ValueError:
+            logger.warning(f"Non-numeric rows in {file_path}; falling back to inferred dtypes")
+            return pd.read_csv(file_path, **read_options)
+    
+    @staticmethod
+    def _read_samples_arrow(file_path: str) -> pd.DataFrame:
+        """Parse the sample rows into Arrow buffers that pandas adopts without copying."""
+        read_options = pacsv.ReadOptions(skip_rows=1, column_names=['acceleration', 'imputed'],
+                                         use_threads=True, block_size=1 << 20)
+        convert_options = pacsv.ConvertOptions(
+            column_types={'acceleration': pa.float32(), 'imputed': pa.uint8()},
+            null_values=[''],
+            strings_can_be_null=False
+        )
+        
+        with pa.memory_map(file_path, 'r') as source:
+            table = pacsv.read_csv(source, read_options=read_options, convert_options=convert_options)
+        return table.to_pandas(split_blocks=True, self_destruct=True)
     
     def _extract_participant_id(self, file_path: str) -> str:
         """Extract participant ID from filename."""
-        filename = file_path.split('/')[-1]
         # Extract first part before underscore as participant ID
-        participant_id = filename.split('_')[0]
-        return participant_id
+        return os.path.basename(file_path).partition('_')[0]
     
     def _parse_header(self, header_line: str) -> Dict:
         """
@@ -86,21 +174,21 @@ class AccelerometerDataLoader:
         metadata = {}
         
         # Extract data type and unit
-        unit_match = re.search(r'acceleration \((\w+)\)', header_line)
+        unit_match = _UNIT_RE.search(header_line)
         metadata['unit'] = unit_match.group(1) if unit_match else 'mg'
         
         # Extract time range
-        time_pattern = r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) - (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})'
-        time_match = re.search(time_pattern, header_line)
+        time_match = _TIME_RE.search(header_line)
         
         if time_match:
             start_time_str = time_match.group(1)
             end_time_str = time_match.group(2)
-            metadata['start_time'] = datetime.strptime(start_time_str, '%Y-%m-%d %H:%M:%S')
-            metadata['end_time'] = datetime.strptime(end_time_str, '%Y-%m-%d %H:%M:%S')
+            # Fixed ISO layout ('YYYY-MM-DD HH:MM:SS'), so skip strptime's format interpretation
+            metadata['start_time'] = datetime.fromisoformat(start_time_str)
+            metadata['end_time'] = datetime.fromisoformat(end_time_str)
         
         # Extract sample rate
-        sample_rate_match = re.search(r'sampleRate = (\d+) seconds', header_line)
+        sample_rate_match = _RATE_RE.search(header_line)
         metadata['sample_rate_seconds'] = int(sample_rate_match.group(1)) if sample_rate_match else 5
         
         # Check if data is imputed
@@ -114,35 +202,36 @@ class AccelerometerDataLoader:
         
         return metadata
     
-    def _add_timestamps(self) -> pd.DataFrame:
-        """Add timestamp column to the data."""
-        data_copy = self.data.copy()
+    def _validate_data(self) -> None:
+        """Validate loaded data for quality and consistency."""
+        acceleration = self.raw_acceleration
+        missing_values = 0
+        acc_min = acc_max = acc_mean = acc_std = np.nan
         
-        if 'start_time' in self.metadata:
-            start_time = self.metadata['start_time']
-            sample_rate = self.metadata['sample_rate_seconds']
-            
-            # Generate timestamps
-            timestamps = [start_time + timedelta(seconds=i * sample_rate) 
-                         for i in range(len(data_copy))]
-            data_copy['timestamp'] = timestamps
+        if len(acceleration):
+            # NaN propagates through min(), so the NaN scan only runs when data is missing
+            acc_min = acceleration.min()
+            if np.isnan(acc_min):
+                missing = np.isnan(acceleration)
+                missing_values = int(missing.sum())
+                acceleration = acceleration[~missing]
+                acc_min = acceleration.min() if len(acceleration) else np.nan
             
-            # Reorder columns
-            data_copy = data_copy[['timestamp', 'acceleration', 'imputed']]
+            if len(acceleration):
+                acc_min = float(widen_float32(acc_min))
+                acc_max = float(widen_float32(acceleration.max()))
+                acc_mean = acceleration.mean(dtype=np.float64)
+                acc_std = acceleration.std(dtype=np.float64, ddof=1) if len(acceleration) > 1 else np.nan
         
-        return data_copy
-    
-    def _validate_data(self) -> None:
-        """Validate loaded data for quality and consistency."""
         validation_results = {
             'total_samples': len(self.data),
-            'missing_values': self.data['acceleration'].isna().sum(),
-            'imputed_samples': self.data['imputed'].sum(),
+            'missing_values': missing_values,
+            'imputed_samples': int(self.raw_imputed.sum()),
             'acceleration_range': {
-                'min': self.data['acceleration'].min(),
-                'max': self.data['acceleration'].max(),
-                'mean': self.data['acceleration'].mean(),
-                'std': self.data['acceleration'].std()
+                'min': acc_min,
+                'max': acc_max,
+                'mean': acc_mean,
+                'std': acc_std
             }
         }
         
@@ -164,6 +253,20 @@ class AccelerometerDataLoader:
         if self.data is None:
             return {}
             
+        # Reductions run in float64 over the NaN-free float32 samples; order statistics are
+        # widened to the recorded decimals, so no float32 rounding reaches the summary
+        acceleration = self.raw_acceleration[~np.isnan(self.raw_acceleration)]
+        if len(acceleration):
+            acceleration_stats = {
+                'mean': float(acceleration.mean(dtype=np.float64)),
+                'std': float(acceleration.std(dtype=np.float64, ddof=1)) if len(acceleration) > 1 else np.nan,
+                'min': float(widen_float32(acceleration.min())),
+                'max': float(widen_float32(acceleration.max())),
+                'median': float(widen_float32(np.median(acceleration.astype(np.float64))))
+            }
+        else:
+            acceleration_stats = dict.fromkeys(('mean', 'std', 'min', 'max', 'median'), np.nan)
+        
         summary = {
             'participant_id': self.participant_id,
             'start_time': self.metadata.get('start_time'),
@@ -172,13 +275,7 @@ class AccelerometerDataLoader:
             'total_samples': len(self.data),
             'imputed_samples': self.data['imputed'].sum(),
             'data_completeness': 1 - (self.data['acceleration'].isna().sum() / len(self.data)),
-            'acceleration_stats': {
-                'mean': float(self.data['acceleration'].mean()),
-                'std': float(self.data['acceleration'].std()),
-                'min': float(self.data['acceleration'].min()),
-                'max': float(self.data['acceleration'].max()),
-                'median': float(self.data['acceleration'].median())
-            }
+            'acceleration_stats': acceleration_stats
         }
         
         return summary
\ No newline at end of file
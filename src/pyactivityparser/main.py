@@ -6,9 +6,14 @@ The main interface for pyActivityParser accelerometer data analysis.
 
 import os
 import logging
+import multiprocessing
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import Dict, List, Optional, Union
 from datetime import datetime
 
+import numpy as np
+
 from .data_loader import AccelerometerDataLoader
 from .core_analysis import CoreAnalysis
 from .quality_assessment import QualityAssessment
@@ -16,13 +21,43 @@ from .activity_analysis import ActivityAnalysis
 from .sleep_analysis import SleepAnalysis
 from .report_generator import ReportGenerator
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+_logging_configured = False
+
+
+def configure_logging(verbose: bool = True) -> None:
+    """
+    Configure logging for pyActivityParser once per process.
+    
+    Installs the package's log format unless the application already configured
+    handlers; later calls are no-ops.
+    
+    Args:
+        verbose (bool): Log at INFO level if True, otherwise only warnings and errors
+    """
+    global _logging_configured
+    if _logging_configured:
+        return
+    _logging_configured = True
+    
+    root_logger = logging.getLogger()
+    if not root_logger.hasHandlers():
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+    if not verbose:
+        root_logger.setLevel(logging.WARNING)
+
+
+def _process_one(data_dir: str, output_dir: str, sample_rate_seconds: int,
+                 verbose: bool, output_format: str, filename: str) -> Dict:
+    """Process one file with a fresh analyzer (module level so worker processes can pickle it)."""
+    analyzer = PyActivityParser(data_dir, output_dir, sample_rate_seconds, verbose,
+                                output_format=output_format)
+    return analyzer.process_file(filename)
+
 
 class PyActivityParser:
     """
@@ -33,7 +68,8 @@ class PyActivityParser:
     """
     
     def __init__(self, data_dir: str = "data", output_dir: str = "output", 
-                 sample_rate_seconds: int = 5, verbose: bool = True):
+                 sample_rate_seconds: int = 5, verbose: bool = True, workers: int = 1,
+                 output_format: str = "csv"):
         """
         Initialize pyActivityParser analyzer.
         
@@ -42,15 +78,18 @@ class PyActivityParser:
             output_dir (str): Directory for output files
             sample_rate_seconds (int): Data sampling interval in seconds
             verbose (bool): Enable verbose logging
+            workers (int): Number of processes used by process_directory (1 = sequential)
+            output_format (str): Data export format, 'csv' or 'parquet' (requires pyarrow)
         """
         self.data_dir = data_dir
         self.output_dir = output_dir
         self.sample_rate_seconds = sample_rate_seconds
         self.verbose = verbose
+        self.workers = workers
+        self.output_format = output_format
         
-        # Set logging level
-        if not verbose:
-            logging.getLogger().setLevel(logging.WARNING)
+        # Configure logging on first use rather than at import time
+        configure_logging(verbose)
         
         # Initialize analysis modules
         self.data_loader = AccelerometerDataLoader()
@@ -58,7 +97,7 @@ class PyActivityParser:
         self.quality_assessment = QualityAssessment()
         self.activity_analysis = ActivityAnalysis(sample_rate_seconds)
         self.sleep_analysis = SleepAnalysis(sample_rate_seconds)
-        self.report_generator = ReportGenerator(output_dir)
+        self.report_generator = ReportGenerator(output_dir, output_format)
         
         logger.info(f"pyActivityParser initialized - Data: {data_dir}, Output: {output_dir}")
     
@@ -171,27 +210,19 @@ class PyActivityParser:
         
         logger.info(f"Found {len(csv_files)} CSV files to process")
         
-        results = []
-        for i, filename in enumerate(csv_files, 1):
-            logger.info(f"Processing file {i}/{len(csv_files)}: {filename}")
-            
-            try:
-                result = self.process_file(filename)
-                results.append(result)
+        if self.workers > 1:
+            results = self._process_files_parallel(csv_files)
+        else:
+            results = []
+            for i, filename in enumerate(csv_files, 1):
+                logger.info(f"Processing file {i}/{len(csv_files)}: {filename}")
                 
-                # Log progress
-                if result['status'] == 'success':
-                    logger.info(f"✓ {filename} completed successfully")
-                else:
-                    logger.warning(f"✗ {filename} failed: {result.get('error', 'Unknown error')}")
-                    
-            except Exception as e:
-                logger.error(f"✗ {filename} failed with exception: {str(e)}")
-                results.append({
-                    'filename': filename,
-                    'status': 'error',
-                    'error': str(e)
-                })
+                try:
+                    result = self.process_file(filename)
+                    self._log_file_result(filename, result)
+                except Exception as e:
+                    result = self._file_exception_result(filename, e)
+                results.append(result)
         
         # Generate batch summary
         logger.info("Generating batch summary...")
@@ -205,6 +236,49 @@ class PyActivityParser:
         
         return results
     
+    def _process_files_parallel(self, csv_files: List[str]) -> List[Dict]:
+        """Process files in worker processes, returning results in input order."""
+        logger.info(f"Processing {len(csv_files)} files with {self.workers} worker processes")
+        
+        # Spawned rather than forked workers: a fork after numba's parallel kernels have run
+        # in this process inherits their threading-layer state, and the workers either die
+        # or keep the interpreter from exiting
+        results = {}
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = {
+                executor.submit(_process_one, self.data_dir, self.output_dir,
+                                self.sample_rate_seconds, self.verbose, self.output_format,
+                                filename): filename
+                for filename in csv_files
+            }
+            for future in as_completed(futures):
+                filename = futures[future]
+                try:
+                    result = future.result()
+                    self._log_file_result(filename, result)
+                except Exception as e:
+                    result = self._file_exception_result(filename, e)
+                results[filename] = result
+        
+        return [results[filename] for filename in csv_files]
+    
+    def _file_exception_result(self, filename: str, error: Exception) -> Dict:
+        """Build the result entry for a file whose processing raised."""
+        logger.error(f"✗ {filename} failed with exception: {str(error)}")
+        return {
+            'filename': filename,
+            'status': 'error',
+            'error': str(error)
+        }
+    
+    def _log_file_result(self, filename: str, result: Dict) -> None:
+        """Log the outcome of one processed file."""
+        if result['status'] == 'success':
+            logger.info(f"✓ {filename} completed successfully")
+        else:
+            logger.warning(f"✗ {filename} failed: {result.get('error', 'Unknown error')}")
+    
     def get_analysis_summary(self, results: List[Dict]) -> Dict:
         """
         Get summary statistics across multiple analyses.
@@ -220,20 +294,18 @@ class PyActivityParser:
         if not successful_results:
             return {'error': 'No successful analyses to summarize'}
         
-        # Extract key metrics
-        quality_scores = []
-        wear_times = []
-        mvpa_minutes = []
-        sleep_hours = []
+        # Extract key metrics (NaN where a section is missing)
+        metric_names = ('quality_scores', 'wear_time_hours', 'mvpa_minutes', 'sleep_hours')
+        metrics = np.full((len(successful_results), len(metric_names)), np.nan)
         
-        for result in successful_results:
+        for row, result in enumerate(successful_results):
             analysis = result.get('analysis_results', {})
             
             # Quality scores
             quality_assessment = analysis.get('quality_assessment', {})
             if quality_assessment:
                 overall_assessment = quality_assessment.get('overall_assessment', {})
-                quality_scores.append(overall_assessment.get('overall_score', 0))
+                metrics[row, 0] = overall_assessment.get('overall_score', 0)
             
             # Activity metrics
             core_analysis = analysis.get('core_analysis', {})
@@ -241,51 +313,35 @@ class PyActivityParser:
                 wear_detection = core_analysis.get('wear_detection', {})
                 activity_levels = core_analysis.get('activity_levels', {})
                 
-                wear_times.append(wear_detection.get('total_wear_time_hours', 0))
-                mvpa_minutes.append(activity_levels.get('mvpa_minutes', 0))
+                metrics[row, 1] = wear_detection.get('total_wear_time_hours', 0)
+                metrics[row, 2] = activity_levels.get('mvpa_minutes', 0)
             
             # Sleep metrics
             sleep_analysis = analysis.get('sleep_analysis', {})
             if sleep_analysis:
                 sleep_summary = sleep_analysis.get('sleep_summary', {})
-                sleep_hours.append(sleep_summary.get('total_sleep_time_hours', 0))
+                metrics[row, 3] = sleep_summary.get('total_sleep_time_hours', 0)
         
-        import numpy as np
+        # Column statistics in one pass each; metrics without any values report 0
+        has_values = ~np.isnan(metrics).all(axis=0)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            stats = {
+                'mean': np.nanmean(metrics, axis=0),
+                'std': np.nanstd(metrics, axis=0),
+                'min': np.nanmin(metrics, axis=0),
+                'max': np.nanmax(metrics, axis=0)
+            }
+        stats = {name: np.where(has_values, values, 0.0) for name, values in stats.items()}
         
         summary = {
             'total_participants': len(results),
             'successful_analyses': len(successful_results),
             'failed_analyses': len(results) - len(successful_results),
-            'success_rate': len(successful_results) / len(results) * 100 if results else 0,
-            
-            'quality_scores': {
-                'mean': float(np.mean(quality_scores)) if quality_scores else 0,
-                'std': float(np.std(quality_scores)) if quality_scores else 0,
-                'min': float(np.min(quality_scores)) if quality_scores else 0,
-                'max': float(np.max(quality_scores)) if quality_scores else 0
-            },
-            
-            'wear_time_hours': {
-                'mean': float(np.mean(wear_times)) if wear_times else 0,
-                'std': float(np.std(wear_times)) if wear_times else 0,
-                'min': float(np.min(wear_times)) if wear_times else 0,
-                'max': float(np.max(wear_times)) if wear_times else 0
-            },
-            
-            'mvpa_minutes': {
-                'mean': float(np.mean(mvpa_minutes)) if mvpa_minutes else 0,
-                'std': float(np.std(mvpa_minutes)) if mvpa_minutes else 0,
-                'min': float(np.min(mvpa_minutes)) if mvpa_minutes else 0,
-                'max': float(np.max(mvpa_minutes)) if mvpa_minutes else 0
-            },
-            
-            'sleep_hours': {
-                'mean': float(np.mean(sleep_hours)) if sleep_hours else 0,
-                'std': float(np.std(sleep_hours)) if sleep_hours else 0,
-                'min': float(np.min(sleep_hours)) if sleep_hours else 0,
-                'max': float(np.max(sleep_hours)) if sleep_hours else 0
-            }
+            'success_rate': len(successful_results) / len(results) * 100 if results else 0
         }
+        for col, metric_name in enumerate(metric_names):
+            summary[metric_name] = {name: float(values[col]) for name, values in stats.items()}
         
         return summary
     
@@ -6,11 +6,24 @@ Provides data quality evaluation and validation metrics.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Tuple, Union
 import logging
 
+from ._kernels import integrity_counts, outlier_counts, widen_float32
+
 logger = logging.getLogger(__name__)
 
+# Quality score components and their weights in the overall score
+SCORE_NAMES = ('data_completeness', 'wear_compliance', 'data_integrity', 'activity_patterns')
+OVERALL_SCORE_WEIGHTS = np.array([0.25, 0.35, 0.25, 0.15])
+
+# Letter grades by overall score: the grade index is the number of thresholds reached
+GRADE_THRESHOLDS = np.array([60.0, 70.0, 80.0, 90.0])
+QUALITY_GRADES = np.array(list('FDCBA'))
+
+# Report sections `assess_quality` can compute; 'overall' is derived from the other four
+QUALITY_SECTIONS = ('overview', 'wear', 'integrity', 'patterns', 'overall')
+
 
 class QualityAssessment:
     """
@@ -19,6 +32,8 @@ class QualityAssessment:
     Inspired by ActivityParser's quality check procedures.
     """
     
+    __slots__ = ('quality_thresholds',)
+    
     def __init__(self):
         self.quality_thresholds = {
             'min_wear_hours_per_day': 10,
@@ -27,7 +42,8 @@ class QualityAssessment:
             'max_outlier_percentage': 1
         }
     
-    def assess_quality(self, data: pd.DataFrame, metadata: Dict, analysis_results: Dict) -> Dict:
+    def assess_quality(self, data: pd.DataFrame, metadata: Dict, analysis_results: Dict,
+                       sections: Tuple[str, ...] = QUALITY_SECTIONS) -> Dict:
         """
         Comprehensive quality assessment of accelerometer data.
         
@@ -35,127 +51,298 @@ class QualityAssessment:
             data (pd.DataFrame): Processed accelerometer data
             metadata (Dict): Data metadata
             analysis_results (Dict): Results from core analysis
+            sections (Tuple[str, ...]): Report sections to compute, any of QUALITY_SECTIONS.
+                'overall' (score and recommendations) is derived from all other sections,
+                so requesting it always computes the full report: a score-only request
+                saves nothing. Without 'overall' the report has no 'overall_assessment'
+                or 'recommendations' keys, and report generation omits the quality scores
             
         Returns:
             Dict: Quality assessment results
         """
         logger.info("Performing quality assessment")
         
+        sections = self._resolve_sections(sections)
+        quality_report = self._build_quality_report(data, metadata, analysis_results,
+                                                    pd.Timestamp.now(), sections)
+        if 'overall' in sections:
+            self._finalize_reports([quality_report])
+        return quality_report
+    
+    def assess_quality_batch(self, participants: List[Tuple[pd.DataFrame, Dict, Dict]],
+                             sections: Tuple[str, ...] = QUALITY_SECTIONS) -> List[Dict]:
+        """
+        Quality assessment for a cohort of participants.
+        
+        Shares the per-call setup (one log line, one assessment timestamp) across the
+        cohort; each participant's statistics are then computed on its own columns, and
+        the quality scores of the whole cohort in one vectorized step.
+        
+        Args:
+            participants (List[Tuple[pd.DataFrame, Dict, Dict]]): (data, metadata,
+                analysis_results) per participant, as passed to `assess_quality`
+            sections (Tuple[str, ...]): Report sections to compute, as in `assess_quality`
+            
+        Returns:
+            List[Dict]: Quality assessment results, in input order
+        """
+        logger.info(f"Performing quality assessment for {len(participants)} participants")
+        
+        sections = self._resolve_sections(sections)
+        assessment_timestamp = pd.Timestamp.now()
+        quality_reports = [
+            self._build_quality_report(data, metadata, analysis_results, assessment_timestamp, sections)
+            for data, metadata, analysis_results in participants
+        ]
+        if 'overall' in sections:
+            self._finalize_reports(quality_reports)
+        
+        return quality_reports
+    
+    @staticmethod
+    def _resolve_sections(sections: Tuple[str, ...]) -> frozenset:
+        """Validate the requested sections and add the ones the overall score depends on."""
+        unknown = set(sections) - set(QUALITY_SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown quality sections: {sorted(unknown)} (expected any of {QUALITY_SECTIONS})")
+        return frozenset(QUALITY_SECTIONS) if 'overall' in sections else frozenset(sections)
+    
+    @staticmethod
+    def _column_views(data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """Acceleration (float32) and imputed (bool) columns as numpy arrays."""
+        # The helpers only run numpy reductions over these. Narrow dtypes halve (float32)
+        # or 8x cut (bool) the bytes every scan moves; core analysis already stores these
+        # dtypes, so the acceleration column is a view. Missing imputed flags (NaN) are
+        # filled first so the bool cast does not count them as imputed
+        return (data['acceleration'].to_numpy(dtype=np.float32, copy=False),
+                data['imputed'].fillna(0).to_numpy(dtype=np.bool_, copy=False))
+    
+    def _build_quality_report(self, data: pd.DataFrame, metadata: Dict, analysis_results: Dict,
+                              assessment_timestamp: pd.Timestamp, sections: frozenset) -> Dict:
+        """Assemble one participant's requested quality sections (scored by `_finalize_reports`)."""
         quality_report = {
             'participant_id': metadata.get('participant_id', 'unknown'),
-            'assessment_timestamp': pd.Timestamp.now(),
-            'data_overview': self._assess_data_overview(data, metadata),
-            'wear_compliance': self._assess_wear_compliance(analysis_results),
-            'data_integrity': self._assess_data_integrity(data),
-            'activity_patterns': self._assess_activity_patterns(analysis_results),
-            'recommendations': []
+            'assessment_timestamp': assessment_timestamp
         }
         
-        # Generate overall quality score and recommendations
-        quality_report['overall_assessment'] = self._generate_overall_assessment(quality_report)
-        quality_report['recommendations'] = self._generate_recommendations(quality_report)
+        # Only the integrity section uses the outlier fences, so the quartile
+        # partition (the costliest reduction) is skipped without it
+        if 'overview' in sections or 'integrity' in sections:
+            acc, imputed = self._column_views(data)
+            acc_stats = self._compute_acc_stats(acc, with_quartiles='integrity' in sections)
+        
+        if 'overview' in sections:
+            quality_report['data_overview'] = self._assess_data_overview(acc_stats, metadata)
+        if 'wear' in sections:
+            quality_report['wear_compliance'] = self._assess_wear_compliance(analysis_results)
+        if 'integrity' in sections:
+            quality_report['data_integrity'] = self._assess_data_integrity(acc, imputed, acc_stats)
+        if 'patterns' in sections:
+            quality_report['activity_patterns'] = self._assess_activity_patterns(analysis_results)
+        if 'overall' in sections:
+            quality_report['recommendations'] = []
         
         return quality_report
     
-    def _assess_data_overview(self, data: pd.DataFrame, metadata: Dict) -> Dict:
-        """Assess basic data characteristics."""
+    def _finalize_reports(self, quality_reports: List[Dict]) -> None:
+        """Add the overall score and recommendations to each quality report (in place)."""
+        assessments = self._generate_overall_assessments(quality_reports)
+        for quality_report, assessment in zip(quality_reports, assessments):
+            quality_report['overall_assessment'] = assessment
+            quality_report['recommendations'] = self._generate_recommendations(quality_report)
+    
+    def _assess_data_overview(self, acc_stats: Dict, metadata: Dict) -> Dict:
+        """Assess basic data characteristics (sample counts from `_compute_acc_stats`)."""
+        n = acc_stats['n']
+        start_time = metadata.get('start_time')
+        end_time = metadata.get('end_time', start_time)
         return {
-            'recording_duration_days': (metadata.get('end_time', metadata.get('start_time')) - 
-                                      metadata.get('start_time')).days if metadata.get('start_time') else 0,
-            'total_samples': len(data),
+            'recording_duration_days': (end_time - start_time).days if start_time else 0,
+            'total_samples': n,
             'expected_samples': metadata.get('expected_samples', 0),
             'sample_rate_seconds': metadata.get('sample_rate_seconds', 5),
-            'data_completeness': 1 - (data['acceleration'].isna().sum() / len(data)),
-            'file_size_mb': len(data) * 8 / (1024 * 1024)  # Rough estimate
+            'data_completeness': 1 - (acc_stats['na_count'] / n) if n else 0.0,
+            'file_size_mb': n * 8 / (1024 * 1024)  # Rough estimate
         }
     
     def _assess_wear_compliance(self, analysis_results: Dict) -> Dict:
         """Assess device wear compliance."""
         wear_detection = analysis_results.get('wear_detection', {})
-        daily_summaries = analysis_results.get('daily_summaries', [])
-        
-        valid_days = [day for day in daily_summaries 
-                     if day.get('wear_time_hours', 0) >= self.quality_thresholds['min_wear_hours_per_day']]
+        wear_hours = self._daily_column(analysis_results, 'wear_time_hours')
+        valid_days_count = int(np.count_nonzero(wear_hours >= self.quality_thresholds['min_wear_hours_per_day']))
         
         compliance = {
             'total_wear_time_hours': wear_detection.get('total_wear_time_hours', 0),
             'wear_percentage': wear_detection.get('wear_percentage', 0),
-            'valid_days_count': len(valid_days),
-            'total_days': len(daily_summaries),
-            'meets_minimum_wear': len(valid_days) >= self.quality_thresholds['min_valid_days'],
-            'average_daily_wear_hours': np.mean([day.get('wear_time_hours', 0) for day in daily_summaries]) if daily_summaries else 0,
+            'valid_days_count': valid_days_count,
+            'total_days': len(wear_hours),
+            'meets_minimum_wear': valid_days_count >= self.quality_thresholds['min_valid_days'],
+            'average_daily_wear_hours': float(wear_hours.mean()) if len(wear_hours) else 0,
             'non_wear_periods': wear_detection.get('non_wear_periods', [])
         }
         
         # Flag long non-wear periods (>2 hours)
-        long_non_wear_periods = [period for period in compliance['non_wear_periods'] 
-                                if period.get('duration_minutes', 0) > 120]
-        compliance['long_non_wear_periods_count'] = len(long_non_wear_periods)
+        non_wear_periods = compliance['non_wear_periods']
+        durations = np.fromiter((period.get('duration_minutes', 0) for period in non_wear_periods),
+                                dtype=np.float64, count=len(non_wear_periods))
+        compliance['long_non_wear_periods_count'] = int(np.count_nonzero(durations > 120))
         
         return compliance
     
-    def _assess_data_integrity(self, data: pd.DataFrame) -> Dict:
+    @staticmethod
+    def _daily_column(analysis_results: Dict, field: str) -> np.ndarray:
+        """One daily-summary field as a float64 array (missing values count as 0)."""
+        daily_columns = analysis_results.get('daily_summaries_soa')
+        if daily_columns and field in daily_columns:
+            return np.asarray(daily_columns[field], dtype=np.float64)
+        
+        # Results without the columnar view: gather the field from the per-day records
+        daily_summaries = analysis_results.get('daily_summaries', [])
+        return np.fromiter((day.get(field, 0) for day in daily_summaries),
+                           dtype=np.float64, count=len(daily_summaries))
+    
+    def _compute_acc_stats(self, arr: np.ndarray, with_quartiles: bool = True) -> Dict:
+        """
+        Summary statistics of the acceleration samples, computed once per assessment.
+        
+        Holds the NaN-free values plus their min/max/mean/std and quartiles, so the
+        integrity and outlier checks share one set of reductions (None when no values
+        remain; the quartiles are also None unless `with_quartiles`).
+        """
+        na_mask = np.isnan(arr)
+        na_count = int(np.count_nonzero(na_mask))
+        values = arr[~na_mask] if na_count else arr
+        
+        stats = {'n': len(arr), 'na_count': na_count, 'values': values,
+                 'min': None, 'max': None, 'mean': None, 'std': None, 'q1': None, 'q3': None}
+        if len(values):
+            stats.update(
+                min=float(widen_float32(values.min())),
+                max=float(widen_float32(values.max())),
+                mean=float(values.mean(dtype=np.float64)),
+                std=float(values.std(dtype=np.float64, ddof=1)) if len(values) > 1 else np.nan
+            )
+            if with_quartiles:
+                stats['q1'], stats['q3'] = self._quartiles(values)
+        return stats
+    
+    @staticmethod
+    def _quartiles(values: np.ndarray) -> Tuple[float, float]:
+        """
+        Q1 and Q3 with linear interpolation, from one O(n) partition of the values.
+        
+        Same definition as np.percentile's default method. The neighbouring float32
+        samples are widened to their recorded decimals and interpolated in float64, so
+        the quartiles match those of the values in the CSV.
+        """
+        positions = (len(values) - 1) * np.array([0.25, 0.75])
+        below = positions.astype(np.int64)
+        above = np.minimum(below + 1, len(values) - 1)
+        partitioned = np.partition(values, np.union1d(below, above))
+        
+        low = widen_float32(partitioned[below])
+        high = widen_float32(partitioned[above])
+        q1, q3 = low + (high - low) * (positions - below)
+        return float(q1), float(q3)
+    
+    def _assess_data_integrity(self, arr: np.ndarray, imputed: np.ndarray, acc_stats: Dict) -> Dict:
         """Assess data integrity and detect anomalies."""
-        acc = data['acceleration']
+        n = acc_stats['n']
+        if n == 0:
+            return self._empty_integrity()
+        
+        # Each count is computed once and reused for the count and percentage fields;
+        # the value-range anomalies come from one fused scan (> 2g, implausibly negative)
+        na_count = acc_stats['na_count']
+        imputed_count = int(imputed.sum())
+        zero_count, negative_count, extremely_high, extremely_low = integrity_counts(arr, 2000, -100)
+        pct_scale = 100 / n
         
         integrity = {
-            'missing_values_count': acc.isna().sum(),
-            'missing_values_percentage': (acc.isna().sum() / len(acc)) * 100,
-            'imputed_values_count': data['imputed'].sum(),
-            'imputed_values_percentage': (data['imputed'].sum() / len(data)) * 100,
-            'zero_values_count': (acc == 0).sum(),
-            'zero_values_percentage': ((acc == 0).sum() / len(acc)) * 100,
-            'negative_values_count': (acc < 0).sum(),
-            'outliers': self._detect_outliers(acc),
-            'data_range': {
-                'min': float(acc.min()),
-                'max': float(acc.max()),
-                'mean': float(acc.mean()),
-                'std': float(acc.std())
-            }
+            'missing_values_count': na_count,
+            'missing_values_percentage': na_count * pct_scale,
+            'imputed_values_count': imputed_count,
+            'imputed_values_percentage': imputed_count * pct_scale,
+            'zero_values_count': zero_count,
+            'zero_values_percentage': zero_count * pct_scale,
+            'negative_values_count': negative_count,
+            'outliers': self._detect_outliers(acc_stats),
+            # None throughout for a fully missing recording (keeps the JSON reports valid)
+            'data_range': {key: acc_stats[key] for key in ('min', 'max', 'mean', 'std')}
         }
         
         # Check for unrealistic values
         integrity['unrealistic_values'] = {
-            'extremely_high': (acc > 2000).sum(),  # > 2g
-            'extremely_low': (acc < -100).sum()    # Negative acceleration
+            'extremely_high': extremely_high,  # > 2g
+            'extremely_low': extremely_low     # Negative acceleration
         }
         
         return integrity
     
-    def _detect_outliers(self, acceleration: pd.Series) -> Dict:
-        """Detect statistical outliers in acceleration data."""
-        Q1 = acceleration.quantile(0.25)
-        Q3 = acceleration.quantile(0.75)
-        IQR = Q3 - Q1
+    def _detect_outliers(self, acc_stats: Dict) -> Dict:
+        """
+        Detect statistical outliers in acceleration data (from `_compute_acc_stats` output).
         
-        # IQR method
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
+        Samples are compared as float32, so one lying exactly on a fence can fall on the
+        other side of it than its recorded decimal would.
+        """
+        values = acc_stats['values']
+        if len(values) == 0:
+            return self._empty_outliers()
         
-        outliers_iqr = ((acceleration < lower_bound) | (acceleration > upper_bound)).sum()
+        IQR = acc_stats['q3'] - acc_stats['q1']
         
-        # Z-score method
-        z_scores = np.abs((acceleration - acceleration.mean()) / acceleration.std())
-        outliers_zscore = (z_scores > 3).sum()
+        # IQR method
+        lower_bound = acc_stats['q1'] - 1.5 * IQR
+        upper_bound = acc_stats['q3'] + 1.5 * IQR
         
+        # Z-score method: |x - mean| > 3 * std, without dividing every sample by std.
+        # Both counts come from a single traversal of the values
+        outliers_iqr, outliers_zscore = outlier_counts(values, lower_bound, upper_bound,
+                                                       acc_stats['mean'], 3 * acc_stats['std'])
+        
+        # Percentages are relative to all samples, missing ones included
+        total_samples = acc_stats['n']
         return {
             'iqr_method': {
                 'count': int(outliers_iqr),
-                'percentage': float((outliers_iqr / len(acceleration)) * 100),
+                'percentage': float((outliers_iqr / total_samples) * 100),
                 'lower_bound': float(lower_bound),
                 'upper_bound': float(upper_bound)
             },
             'zscore_method': {
                 'count': int(outliers_zscore),
-                'percentage': float((outliers_zscore / len(acceleration)) * 100)
+                'percentage': float((outliers_zscore / total_samples) * 100)
             }
         }
     
+    @staticmethod
+    def _empty_outliers() -> Dict:
+        """Outlier summary for input without any non-missing values."""
+        return {
+            'iqr_method': {'count': 0, 'percentage': 0.0, 'lower_bound': 0.0, 'upper_bound': 0.0},
+            'zscore_method': {'count': 0, 'percentage': 0.0}
+        }
+    
+    def _empty_integrity(self) -> Dict:
+        """Integrity summary for an empty recording."""
+        return {
+            'missing_values_count': 0,
+            'missing_values_percentage': 0.0,
+            'imputed_values_count': 0,
+            'imputed_values_percentage': 0.0,
+            'zero_values_count': 0,
+            'zero_values_percentage': 0.0,
+            'negative_values_count': 0,
+            'outliers': self._empty_outliers(),
+            'data_range': {'min': None, 'max': None, 'mean': None, 'std': None},
+            'unrealistic_values': {'extremely_high': 0, 'extremely_low': 0}
+        }
+    
     def _assess_activity_patterns(self, analysis_results: Dict) -> Dict:
         """Assess activity pattern characteristics."""
         activity_levels = analysis_results.get('activity_levels', {})
-        daily_summaries = analysis_results.get('daily_summaries', [])
+        daily_means = self._daily_column(analysis_results, 'mean_acceleration')
         
         patterns = {
             'sedentary_percentage': activity_levels.get('sedentary_percentage', 0),
@@ -167,86 +354,79 @@ class QualityAssessment:
         }
         
         # Calculate daily variability
-        if daily_summaries:
-            daily_means = [day.get('mean_acceleration', 0) for day in daily_summaries]
+        if len(daily_means):
+            means_std = float(daily_means.std())
+            means_mean = float(daily_means.mean())
             patterns['daily_variability'] = {
-                'mean_acceleration_std': float(np.std(daily_means)),
-                'mean_acceleration_cv': float(np.std(daily_means) / np.mean(daily_means)) if np.mean(daily_means) > 0 else 0
+                'mean_acceleration_std': means_std,
+                'mean_acceleration_cv': means_std / means_mean if means_mean > 0 else 0
             }
         
         # Activity pattern flags
+        active_percentage = (patterns['light_activity_percentage'] + patterns['moderate_activity_percentage'] +
+                             patterns['high_activity_percentage'])
         patterns['flags'] = {
             'extremely_sedentary': patterns['sedentary_percentage'] > 95,
-            'very_low_activity': patterns['light_activity_percentage'] + patterns['moderate_activity_percentage'] + patterns['high_activity_percentage'] < 5,
+            'very_low_activity': active_percentage < 5,
             'unrealistic_high_activity': patterns['high_activity_percentage'] > 50
         }
         
         return patterns
     
-    def _generate_overall_assessment(self, quality_report: Dict) -> Dict:
-        """Generate overall quality assessment and score."""
-        scores = {}
-        
-        # Data completeness score (0-100)
-        data_completeness = quality_report['data_overview']['data_completeness']
-        scores['data_completeness'] = min(100, data_completeness * 100)
-        
-        # Wear compliance score (0-100)
-        wear_compliance = quality_report['wear_compliance']
-        compliance_score = 0
-        if wear_compliance['meets_minimum_wear']:
-            compliance_score += 50
-        compliance_score += min(50, wear_compliance['wear_percentage'] / 2)
-        scores['wear_compliance'] = compliance_score
-        
-        # Data integrity score (0-100)
-        integrity = quality_report['data_integrity']
-        integrity_score = 100
-        integrity_score -= min(30, integrity['imputed_values_percentage'])
-        integrity_score -= min(20, integrity['outliers']['iqr_method']['percentage'] * 10)
-        integrity_score -= min(20, integrity['missing_values_percentage'] * 2)
-        scores['data_integrity'] = max(0, integrity_score)
+    def _generate_overall_assessments(self, quality_reports: List[Dict]) -> List[Dict]:
+        """
+        Generate overall quality assessments and scores for one or more reports.
         
-        # Activity pattern score (0-100)
-        patterns = quality_report['activity_patterns']
-        pattern_score = 100
-        if patterns['flags']['extremely_sedentary']:
-            pattern_score -= 30
-        if patterns['flags']['very_low_activity']:
-            pattern_score -= 40
-        if patterns['flags']['unrealistic_high_activity']:
-            pattern_score -= 50
-        scores['activity_patterns'] = max(0, pattern_score)
+        The raw metrics form an (N, 9) matrix, so each score is one array expression
+        over the whole cohort rather than per-participant scalar arithmetic.
+        """
+        metrics = np.array([
+            (report['data_overview']['data_completeness'],
+             report['wear_compliance']['meets_minimum_wear'],
+             report['wear_compliance']['wear_percentage'],
+             report['data_integrity']['imputed_values_percentage'],
+             report['data_integrity']['outliers']['iqr_method']['percentage'],
+             report['data_integrity']['missing_values_percentage'],
+             report['activity_patterns']['flags']['extremely_sedentary'],
+             report['activity_patterns']['flags']['very_low_activity'],
+             report['activity_patterns']['flags']['unrealistic_high_activity'])
+            for report in quality_reports
+        ], dtype=np.float64).reshape(len(quality_reports), 9)
+        (completeness, meets_minimum_wear, wear_percentage, imputed_pct, outlier_pct, missing_pct,
+         extremely_sedentary, very_low_activity, unrealistic_high_activity) = metrics.T
+        
+        # Each column is a 0-100 score; flags enter as 0/1 multipliers
+        scores = np.column_stack([
+            # Data completeness
+            np.minimum(100, completeness * 100),
+            # Wear compliance: 50 for meeting the minimum wear, up to 50 from the wear percentage
+            meets_minimum_wear * 50 + np.minimum(50, wear_percentage / 2),
+            # Data integrity
+            np.maximum(0, 100 - np.minimum(30, imputed_pct) - np.minimum(20, outlier_pct * 10)
+                       - np.minimum(20, missing_pct * 2)),
+            # Activity patterns
+            np.maximum(0, 100 - extremely_sedentary * 30 - very_low_activity * 40
+                       - unrealistic_high_activity * 50)
+        ])
         
         # Overall score (weighted average)
-        overall_score = (
-            scores['data_completeness'] * 0.25 +
-            scores['wear_compliance'] * 0.35 +
-            scores['data_integrity'] * 0.25 +
-            scores['activity_patterns'] * 0.15
-        )
-        
-        assessment = {
-            'individual_scores': scores,
-            'overall_score': round(overall_score, 1),
-            'quality_grade': self._get_quality_grade(overall_score),
-            'data_usable': overall_score >= 60  # Minimum threshold for usable data
-        }
-        
-        return assessment
+        overall_scores = (scores * OVERALL_SCORE_WEIGHTS).sum(axis=1)
+        grades = self._get_quality_grade(overall_scores).tolist()
+        
+        return [
+            {
+                'individual_scores': dict(zip(SCORE_NAMES, row)),
+                'overall_score': round(overall_score, 1),
+                'quality_grade': grade,
+                'data_usable': overall_score >= 60  # Minimum threshold for usable data
+            }
+            for row, overall_score, grade in zip(scores.tolist(), overall_scores.tolist(), grades)
+        ]
     
-    def _get_quality_grade(self, score: float) -> str:
-        """Convert numeric score to letter grade."""
-        if score >= 90:
-            return 'A'
-        elif score >= 80:
-            return 'B'
-        elif score >= 70:
-            return 'C'
-        elif score >= 60:
-            return 'D'
-        else:
-            return 'F'
+    def _get_quality_grade(self, score: Union[float, np.ndarray]) -> Union[str, np.ndarray]:
+        """Convert numeric score(s) to letter grade(s); an array of scores is graded in one lookup."""
+        grades = QUALITY_GRADES[np.searchsorted(GRADE_THRESHOLDS, score, side='right')]
+        return str(grades) if np.ndim(grades) == 0 else grades
     
     def _generate_recommendations(self, quality_report: Dict) -> List[str]:
         """Generate recommendations based on quality assessment."""
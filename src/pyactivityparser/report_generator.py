@@ -6,14 +6,44 @@ Generates comprehensive analysis reports in various formats.
 
 import pandas as pd
 import numpy as np
+import csv
 import json
-from typing import Dict, List, Optional
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import logging
 import os
+from pathlib import Path
+
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    PYARROW_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+EXPORT_FORMATS = ('csv', 'parquet')
+
+# Report files are written in one call each; a large buffer keeps that to a few syscalls
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Explicit CSV writer settings shared by all exports. Floats keep full precision:
+# a shorter float_format writes faster but would truncate the exported metrics.
+CSV_WRITE_OPTIONS = {'index': False, 'quoting': csv.QUOTE_MINIMAL, 'chunksize': 65_536}
+
+# Column order of batch_summary.csv
+BATCH_SUMMARY_COLUMNS = ['participant_id', 'processing_status', 'quality_score',
+                         'wear_time_hours', 'mvpa_minutes', 'sleep_hours', 'sleep_efficiency']
+
 
 class ReportGenerator:
     """
@@ -22,23 +52,35 @@ class ReportGenerator:
     Inspired by ActivityParser's reporting functionality across all parts.
     """
     
-    def __init__(self, output_dir: str = "output"):
+    def __init__(self, output_dir: str = "output", output_format: str = "csv"):
+        if output_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format} (expected one of {EXPORT_FORMATS})")
+        if output_format == 'parquet' and not PYARROW_AVAILABLE:
+            logger.warning("pyarrow is not installed; writing CSV data exports instead of Parquet")
+            output_format = 'csv'
+        
         self.output_dir = output_dir
+        self.output_format = output_format
+        # Resolved once; every report joins file names onto these
+        self._reports_dir = Path(output_dir) / "reports"
+        self._data_dir = Path(output_dir) / "data"
         self.ensure_output_directory()
     
     def ensure_output_directory(self):
         """Ensure output directory exists."""
-        os.makedirs(self.output_dir, exist_ok=True)
-        os.makedirs(os.path.join(self.output_dir, "reports"), exist_ok=True)
-        os.makedirs(os.path.join(self.output_dir, "data"), exist_ok=True)
+        self._reports_dir.mkdir(parents=True, exist_ok=True)
+        self._data_dir.mkdir(parents=True, exist_ok=True)
     
-    def generate_comprehensive_report(self, participant_id: str, analysis_results: Dict) -> Dict:
+    def generate_comprehensive_report(self, participant_id: str, analysis_results: Dict,
+                                      stream_large_arrays: bool = False) -> Dict:
         """
         Generate a comprehensive analysis report for a participant.
         
         Args:
             participant_id (str): Participant identifier
             analysis_results (Dict): Complete analysis results
+            stream_large_arrays (bool): Write daily summaries and hourly data row by row to
+                companion .ndjson files, referenced from the JSON summary instead of embedded
             
         Returns:
             Dict: Report generation results with file paths
@@ -46,15 +88,21 @@ class ReportGenerator:
         logger.info(f"Generating comprehensive report for participant {participant_id}")
         
         report_timestamp = datetime.now()
+        # Shared by the JSON report, the text summary and the returned summary
+        key_findings = self._extract_key_findings(analysis_results)
         
         # Generate different report formats
         report_files = {}
         
+        # Large per-row arrays are streamed out first so the JSON summary stays small
+        streamed_files = self._stream_large_arrays(participant_id, analysis_results) if stream_large_arrays else {}
+        report_files.update(streamed_files)
+        
         # 1. JSON summary report
-        json_report = self._generate_json_report(participant_id, analysis_results, report_timestamp)
-        json_file = os.path.join(self.output_dir, "reports", f"{participant_id}_summary.json")
-        with open(json_file, 'w') as f:
-            json.dump(json_report, f, indent=2, default=str)
+        json_report = self._generate_json_report(participant_id, analysis_results, report_timestamp,
+                                                 key_findings, streamed_files)
+        json_file = str(self._reports_dir / f"{participant_id}_summary.json")
+        self._write_json(json_file, json_report)
         report_files['json_summary'] = json_file
         
         # 2. CSV data exports
@@ -62,9 +110,10 @@ class ReportGenerator:
         report_files.update(csv_files)
         
         # 3. Text summary report
-        text_report = self._generate_text_summary(participant_id, analysis_results, report_timestamp)
-        text_file = os.path.join(self.output_dir, "reports", f"{participant_id}_summary.txt")
-        with open(text_file, 'w') as f:
+        text_report = self._generate_text_summary(participant_id, analysis_results, report_timestamp,
+                                                  key_findings)
+        text_file = str(self._reports_dir / f"{participant_id}_summary.txt")
+        with open(text_file, 'w', buffering=WRITE_BUFFER_SIZE) as f:
             f.write(text_report)
         report_files['text_summary'] = text_file
         
@@ -74,12 +123,162 @@ class ReportGenerator:
             'participant_id': participant_id,
             'report_timestamp': report_timestamp,
             'files_generated': report_files,
-            'summary': self._extract_key_findings(analysis_results)
+            'summary': key_findings
         }
     
+    def _write_json(self, json_file: str, json_report: Dict) -> None:
+        """Write a JSON report, with orjson when it is installed."""
+        if ORJSON_AVAILABLE:
+            # Datetimes and arrays go through _json_default (once per array) so both
+            # writers produce the same document
+            options = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            with open(json_file, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                f.write(orjson.dumps(json_report, default=self._json_default, option=options))
+        else:
+            # orjson's output: non-finite floats as null and raw UTF-8 rather than \u escapes
+            with open(json_file, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+                json.dump(self._json_safe(json_report), f, indent=2, ensure_ascii=False,
+                          allow_nan=False, default=self._json_safe_default)
+    
+    def _stream_large_arrays(self, participant_id: str, analysis_results: Dict) -> Dict:
+        """Write daily summaries and hourly data as NDJSON (one row per line) and return their paths."""
+        streamed_files = {}
+        
+        daily_summaries = analysis_results.get('core_analysis', {}).get('daily_summaries', [])
+        if daily_summaries:
+            path = str(self._data_dir / f"{participant_id}_daily.ndjson")
+            self._write_ndjson(path, daily_summaries)
+            streamed_files['daily_ndjson'] = path
+        
+        hourly_data = analysis_results.get('activity_analysis', {}).get('hourly_patterns', {}).get('hourly_data', {})
+        if hourly_data:
+            path = str(self._data_dir / f"{participant_id}_hourly.ndjson")
+            self._write_ndjson(path, ({'hour': hour, **stats} for hour, stats in hourly_data.items()))
+            streamed_files['hourly_ndjson'] = path
+        
+        return streamed_files
+    
+    def _write_ndjson(self, path: str, rows) -> None:
+        """Serialize rows one at a time, so only the current line is held in memory."""
+        if ORJSON_AVAILABLE:
+            options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            dumps = lambda row: orjson.dumps(row, default=self._json_default, option=options)
+        else:
+            dumps = lambda row: json.dumps(self._json_safe(row), separators=(',', ':'), ensure_ascii=False,
+                                           allow_nan=False, default=self._json_safe_default).encode('utf-8')
+        
+        with open(path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            for row in rows:
+                f.write(dumps(row))
+                f.write(b'\n')
+    
+    def generate_reports(self, participants: List[Tuple[str, Dict]],
+                         workers: Optional[int] = None) -> List[Dict]:
+        """
+        Generate comprehensive reports for several participants in parallel.
+        
+        Workers are spawned: starting them costs about a second of imports, and each
+        participant's analysis results (roughly 4 MB per recorded week) are pickled to a
+        worker, while writing one report takes some 30 ms. A pool therefore only pays off
+        for many participants on several free cores; for a handful, workers=1 is faster.
+        
+        Args:
+            participants (List[Tuple[str, Dict]]): (participant_id, analysis_results) pairs
+            workers (Optional[int]): Number of worker processes (default: CPU count; 1 = sequential)
+            
+        Returns:
+            List[Dict]: Report generation results, in input order
+        """
+        if workers == 1 or len(participants) <= 1:
+            return [self._generate_report_for(participant) for participant in participants]
+        
+        # Only output_dir/output_format travel with self, so the generator pickles cheaply.
+        # Spawned rather than forked workers: a fork after numba's parallel kernels have run
+        # in this process keeps the interpreter from exiting
+        payloads = [(participant_id, self._report_payload(analysis_results))
+                    for participant_id, analysis_results in participants]
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            return list(executor.map(self._generate_report_for, payloads, chunksize=4))
+    
+    @staticmethod
+    def _report_payload(analysis_results: Dict) -> Dict:
+        """The analysis results without the per-sample frame that no report reads."""
+        core_analysis = analysis_results.get('core_analysis')
+        if not core_analysis or 'processed_data' not in core_analysis:
+            return analysis_results
+        core_analysis = {key: value for key, value in core_analysis.items() if key != 'processed_data'}
+        return {**analysis_results, 'core_analysis': core_analysis}
+    
+    def _generate_report_for(self, participant: Tuple[str, Dict]) -> Dict:
+        """Generate the report for one (participant_id, analysis_results) pair."""
+        participant_id, analysis_results = participant
+        return self.generate_comprehensive_report(participant_id, analysis_results)
+    
+    @staticmethod
+    def _json_default(obj):
+        """Serialize values the json module cannot handle natively."""
+        if isinstance(obj, np.ndarray):
+            if np.issubdtype(obj.dtype, np.datetime64):
+                return pd.to_datetime(obj).astype(str).tolist()
+            return obj.tolist()
+        if isinstance(obj, (np.integer, np.floating, np.bool_)):
+            return obj.item()
+        return str(obj)
+    
+    @classmethod
+    def _json_safe(cls, obj):
+        """Replace NaN and infinite floats with None, as orjson serializes them, for the json module."""
+        if isinstance(obj, float):
+            return obj if math.isfinite(obj) else None
+        if isinstance(obj, dict):
+            return {key: cls._json_safe(value) for key, value in obj.items()}
+        if isinstance(obj, (list, tuple)):
+            return [cls._json_safe(value) for value in obj]
+        return obj
+    
+    @classmethod
+    def _json_safe_default(cls, obj):
+        """`_json_default` for the json module, with non-finite floats in its output replaced."""
+        return cls._json_safe(cls._json_default(obj))
+    
+    @staticmethod
+    def _format_bout_times(bouts: Dict) -> Dict:
+        """Convert int64-nanosecond bout times ('*_time_ns') to datetimes for export."""
+        formatted = {}
+        for key, values in bouts.items():
+            if key.endswith('_ns'):
+                formatted[key[:-3]] = pd.to_datetime(values, unit='ns').to_numpy()
+            else:
+                formatted[key] = values
+        return formatted
+    
     def _generate_json_report(self, participant_id: str, analysis_results: Dict, 
-                            timestamp: datetime) -> Dict:
+                            timestamp: datetime, key_findings: List[str],
+                            streamed_files: Optional[Dict] = None) -> Dict:
         """Generate comprehensive JSON report."""
+        streamed_files = streamed_files or {}
+        activity_analysis = dict(analysis_results.get('activity_analysis', {}))
+        if 'activity_bouts' in activity_analysis:
+            activity_analysis['activity_bouts'] = {
+                bout_type: self._format_bout_times(bouts)
+                for bout_type, bouts in activity_analysis['activity_bouts'].items()
+            }
+        if 'hourly_ndjson' in streamed_files:
+            hourly_patterns = dict(activity_analysis['hourly_patterns'])
+            del hourly_patterns['hourly_data']
+            hourly_patterns['hourly_data_file'] = streamed_files['hourly_ndjson']
+            activity_analysis['hourly_patterns'] = hourly_patterns
+        
+        core_analysis = {
+            'basic_metrics': analysis_results.get('core_analysis', {}).get('basic_metrics', {}),
+            'wear_detection': analysis_results.get('core_analysis', {}).get('wear_detection', {}),
+            'activity_levels': analysis_results.get('core_analysis', {}).get('activity_levels', {}),
+            'quality_metrics': analysis_results.get('core_analysis', {}).get('quality_metrics', {})
+        }
+        if 'daily_ndjson' in streamed_files:
+            core_analysis['daily_summaries_file'] = streamed_files['daily_ndjson']
+        
         return {
             'report_info': {
                 'participant_id': participant_id,
@@ -89,19 +288,14 @@ class ReportGenerator:
             },
             'data_summary': analysis_results.get('data_summary', {}),
             'quality_assessment': analysis_results.get('quality_assessment', {}),
-            'core_analysis': {
-                'basic_metrics': analysis_results.get('core_analysis', {}).get('basic_metrics', {}),
-                'wear_detection': analysis_results.get('core_analysis', {}).get('wear_detection', {}),
-                'activity_levels': analysis_results.get('core_analysis', {}).get('activity_levels', {}),
-                'quality_metrics': analysis_results.get('core_analysis', {}).get('quality_metrics', {})
-            },
-            'activity_analysis': analysis_results.get('activity_analysis', {}),
+            'core_analysis': core_analysis,
+            'activity_analysis': activity_analysis,
             'sleep_analysis': analysis_results.get('sleep_analysis', {}),
-            'key_findings': self._extract_key_findings(analysis_results)
+            'key_findings': key_findings
         }
     
     def _generate_csv_exports(self, participant_id: str, analysis_results: Dict) -> Dict:
-        """Generate CSV data exports."""
+        """Generate data exports (CSV or Parquet, per `output_format`)."""
         csv_files = {}
         
         # 1. Daily summary CSV
@@ -109,207 +303,202 @@ class ReportGenerator:
         if daily_summaries:
             daily_df = pd.DataFrame(daily_summaries)
             daily_df['participant_id'] = participant_id
-            daily_file = os.path.join(self.output_dir, "data", f"{participant_id}_daily_summary.csv")
-            daily_df.to_csv(daily_file, index=False)
-            csv_files['daily_summary'] = daily_file
+            csv_files['daily_summary'] = self._write_table(daily_df, participant_id, "daily_summary")
         
         # 2. Sleep periods CSV
         sleep_periods = analysis_results.get('sleep_analysis', {}).get('sleep_characteristics', [])
         if sleep_periods:
             sleep_df = pd.DataFrame(sleep_periods)
             sleep_df['participant_id'] = participant_id
-            sleep_file = os.path.join(self.output_dir, "data", f"{participant_id}_sleep_periods.csv")
-            sleep_df.to_csv(sleep_file, index=False)
-            csv_files['sleep_periods'] = sleep_file
+            csv_files['sleep_periods'] = self._write_table(sleep_df, participant_id, "sleep_periods")
         
         # 3. Activity bouts CSV
         activity_analysis = analysis_results.get('activity_analysis', {})
         if 'activity_bouts' in activity_analysis:
-            bouts_data = []
+            bout_frames = []
             for bout_type, bouts in activity_analysis['activity_bouts'].items():
-                for bout in bouts:
-                    bout_record = bout.copy()
-                    bout_record['participant_id'] = participant_id
-                    bout_record['bout_type'] = bout_type
-                    bouts_data.append(bout_record)
+                bout_df = pd.DataFrame(self._format_bout_times(bouts))
+                if len(bout_df) > 0:
+                    bout_frames.append(bout_df.assign(participant_id=participant_id, bout_type=bout_type))
             
-            if bouts_data:
-                bouts_df = pd.DataFrame(bouts_data)
-                bouts_file = os.path.join(self.output_dir, "data", f"{participant_id}_activity_bouts.csv")
-                bouts_df.to_csv(bouts_file, index=False)
-                csv_files['activity_bouts'] = bouts_file
+            if bout_frames:
+                bouts_df = pd.concat(bout_frames, ignore_index=True)
+                csv_files['activity_bouts'] = self._write_table(bouts_df, participant_id, "activity_bouts")
         
         # 4. Hourly patterns CSV
         hourly_patterns = activity_analysis.get('hourly_patterns', {}).get('hourly_data', {})
         if hourly_patterns:
-            hourly_data = []
-            for hour, stats in hourly_patterns.items():
-                record = stats.copy()
-                record['participant_id'] = participant_id
-                record['hour'] = hour
-                hourly_data.append(record)
-            
-            hourly_df = pd.DataFrame(hourly_data)
-            hourly_file = os.path.join(self.output_dir, "data", f"{participant_id}_hourly_patterns.csv")
-            hourly_df.to_csv(hourly_file, index=False)
-            csv_files['hourly_patterns'] = hourly_file
+            hourly_df = pd.DataFrame.from_dict(hourly_patterns, orient='index')
+            hourly_df = hourly_df.assign(participant_id=participant_id, hour=hourly_df.index).reset_index(drop=True)
+            csv_files['hourly_patterns'] = self._write_table(hourly_df, participant_id, "hourly_patterns")
         
         return csv_files
     
+    def _write_table(self, df: pd.DataFrame, participant_id: str, name: str) -> str:
+        """Write one data export in the configured format and return its path."""
+        if self.output_format == 'parquet':
+            # Columnar binary: typed buffers, no per-cell string formatting
+            path = str(self._data_dir / f"{participant_id}_{name}.parquet")
+            df.to_parquet(path, engine='pyarrow', compression='zstd', index=False)
+        else:
+            path = str(self._data_dir / f"{participant_id}_{name}.csv")
+            df.to_csv(path, **CSV_WRITE_OPTIONS)
+        return path
+    
     def _generate_text_summary(self, participant_id: str, analysis_results: Dict, 
-                             timestamp: datetime) -> str:
+                             timestamp: datetime, key_findings: List[str]) -> str:
         """Generate human-readable text summary."""
         
-        # Extract key data
+        # Extract key data (each nested section looked up once)
         data_summary = analysis_results.get('data_summary', {})
-        quality_assessment = analysis_results.get('quality_assessment', {})
+        quality_assessment = analysis_results.get('quality_assessment') or {}
         core_analysis = analysis_results.get('core_analysis', {})
         activity_analysis = analysis_results.get('activity_analysis', {})
         sleep_analysis = analysis_results.get('sleep_analysis', {})
         
-        report_lines = [
-            "="*80,
-            f"PyActivityParser Accelerometer Data Analysis Report",
-            f"Participant ID: {participant_id}",
-            f"Generated: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}",
-            "="*80,
-            "",
-            "DATA OVERVIEW",
-            "-"*40,
-            f"Recording period: {data_summary.get('start_time', 'N/A')} to {data_summary.get('end_time', 'N/A')}",
-            f"Sample rate: {data_summary.get('sample_rate_seconds', 'N/A')} seconds",
-            f"Total samples: {data_summary.get('total_samples', 'N/A'):,}",
-            f"Data completeness: {data_summary.get('data_completeness', 0)*100:.1f}%",
-            f"Imputed samples: {data_summary.get('imputed_samples', 'N/A'):,}",
-            "",
+        rule = "=" * 80
+        divider = "-" * 40
+        
+        parts = [
+            f"{rule}\n"
+            f"PyActivityParser Accelerometer Data Analysis Report\n"
+            f"Participant ID: {participant_id}\n"
+            f"Generated: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"{rule}\n"
+            f"\n"
+            f"DATA OVERVIEW\n"
+            f"{divider}\n"
+            f"Recording period: {data_summary.get('start_time', 'N/A')} to {data_summary.get('end_time', 'N/A')}\n"
+            f"Sample rate: {data_summary.get('sample_rate_seconds', 'N/A')} seconds\n"
+            f"Total samples: {data_summary.get('total_samples', 'N/A'):,}\n"
+            f"Data completeness: {data_summary.get('data_completeness', 0)*100:.1f}%\n"
+            f"Imputed samples: {data_summary.get('imputed_samples', 'N/A'):,}\n"
+            f"\n"
         ]
         
-        # Quality Assessment
-        if quality_assessment:
-            overall_assessment = quality_assessment.get('overall_assessment', {})
-            report_lines.extend([
-                "QUALITY ASSESSMENT",
-                "-"*40,
-                f"Overall quality score: {overall_assessment.get('overall_score', 'N/A')}/100 (Grade: {overall_assessment.get('quality_grade', 'N/A')})",
-                f"Data usable for analysis: {'Yes' if overall_assessment.get('data_usable', False) else 'No'}",
-                "",
-                "Quality Scores:",
-                f"  Data completeness: {overall_assessment.get('individual_scores', {}).get('data_completeness', 'N/A'):.1f}/100",
-                f"  Wear compliance: {overall_assessment.get('individual_scores', {}).get('wear_compliance', 'N/A'):.1f}/100",
-                f"  Data integrity: {overall_assessment.get('individual_scores', {}).get('data_integrity', 'N/A'):.1f}/100",
-                f"  Activity patterns: {overall_assessment.get('individual_scores', {}).get('activity_patterns', 'N/A'):.1f}/100",
-                "",
-            ])
+        # Quality Assessment (scores are absent from reports built without the 'overall' section)
+        overall_assessment = quality_assessment.get('overall_assessment')
+        if overall_assessment:
+            scores = overall_assessment.get('individual_scores', {})
+            parts.append(
+                f"QUALITY ASSESSMENT\n"
+                f"{divider}\n"
+                f"Overall quality score: {overall_assessment.get('overall_score', 'N/A')}/100 (Grade: {overall_assessment.get('quality_grade', 'N/A')})\n"
+                f"Data usable for analysis: {'Yes' if overall_assessment.get('data_usable', False) else 'No'}\n"
+                f"\n"
+                f"Quality Scores:\n"
+                f"  Data completeness: {scores.get('data_completeness', 'N/A'):.1f}/100\n"
+                f"  Wear compliance: {scores.get('wear_compliance', 'N/A'):.1f}/100\n"
+                f"  Data integrity: {scores.get('data_integrity', 'N/A'):.1f}/100\n"
+                f"  Activity patterns: {scores.get('activity_patterns', 'N/A'):.1f}/100\n"
+                f"\n"
+            )
             
             # Recommendations
             recommendations = quality_assessment.get('recommendations', [])
             if recommendations:
-                report_lines.extend([
-                    "Recommendations:",
-                    *[f"  • {rec}" for rec in recommendations],
-                    "",
-                ])
+                parts.append("Recommendations:\n" + "".join(f"  • {rec}\n" for rec in recommendations) + "\n")
         
         # Wear Time Analysis
         wear_detection = core_analysis.get('wear_detection', {})
         if wear_detection:
-            report_lines.extend([
-                "WEAR TIME ANALYSIS",
-                "-"*40,
-                f"Total wear time: {wear_detection.get('total_wear_time_hours', 0):.1f} hours",
-                f"Wear compliance: {wear_detection.get('wear_percentage', 0):.1f}%",
-                f"Non-wear periods: {len(wear_detection.get('non_wear_periods', []))}",
-                "",
-            ])
+            parts.append(
+                f"WEAR TIME ANALYSIS\n"
+                f"{divider}\n"
+                f"Total wear time: {wear_detection.get('total_wear_time_hours', 0):.1f} hours\n"
+                f"Wear compliance: {wear_detection.get('wear_percentage', 0):.1f}%\n"
+                f"Non-wear periods: {len(wear_detection.get('non_wear_periods', []))}\n"
+                f"\n"
+            )
         
         # Activity Analysis
         activity_levels = core_analysis.get('activity_levels', {})
         if activity_levels:
-            report_lines.extend([
-                "ACTIVITY ANALYSIS",
-                "-"*40,
-                f"Sedentary time: {activity_levels.get('sedentary_percentage', 0):.1f}%",
-                f"Light activity: {activity_levels.get('light_activity_percentage', 0):.1f}%",
-                f"Moderate activity: {activity_levels.get('moderate_activity_percentage', 0):.1f}%",
-                f"Vigorous activity: {activity_levels.get('high_activity_percentage', 0):.1f}%",
-                f"MVPA minutes: {activity_levels.get('mvpa_minutes', 0):.1f}",
-                f"Estimated daily steps: {activity_levels.get('average_daily_steps_estimate', 0):.0f}",
-                "",
-            ])
+            parts.append(
+                f"ACTIVITY ANALYSIS\n"
+                f"{divider}\n"
+                f"Sedentary time: {activity_levels.get('sedentary_percentage', 0):.1f}%\n"
+                f"Light activity: {activity_levels.get('light_activity_percentage', 0):.1f}%\n"
+                f"Moderate activity: {activity_levels.get('moderate_activity_percentage', 0):.1f}%\n"
+                f"Vigorous activity: {activity_levels.get('high_activity_percentage', 0):.1f}%\n"
+                f"MVPA minutes: {activity_levels.get('mvpa_minutes', 0):.1f}\n"
+                f"Estimated daily steps: {activity_levels.get('average_daily_steps_estimate', 0):.0f}\n"
+                f"\n"
+            )
         
         # Activity Bouts
         if activity_analysis and 'summary_metrics' in activity_analysis:
             summary = activity_analysis['summary_metrics']
-            report_lines.extend([
-                "ACTIVITY BOUTS",
-                "-"*40,
-                f"MVPA bouts: {summary.get('mvpa_bout_count', 0)}",
-                f"Total MVPA bout time: {summary.get('total_mvpa_bout_minutes', 0):.1f} minutes",
-                f"Average MVPA bout duration: {summary.get('average_mvpa_bout_duration', 0):.1f} minutes",
-                f"Meets WHO MVPA guidelines: {'Yes' if summary.get('meets_who_mvpa_guidelines', False) else 'No'}",
-                "",
-            ])
+            parts.append(
+                f"ACTIVITY BOUTS\n"
+                f"{divider}\n"
+                f"MVPA bouts: {summary.get('mvpa_bout_count', 0)}\n"
+                f"Total MVPA bout time: {summary.get('total_mvpa_bout_minutes', 0):.1f} minutes\n"
+                f"Average MVPA bout duration: {summary.get('average_mvpa_bout_duration', 0):.1f} minutes\n"
+                f"Meets WHO MVPA guidelines: {'Yes' if summary.get('meets_who_mvpa_guidelines', False) else 'No'}\n"
+                f"\n"
+            )
         
         # Sleep Analysis
         sleep_summary = sleep_analysis.get('sleep_summary', {})
         if sleep_summary:
-            report_lines.extend([
-                "SLEEP ANALYSIS",
-                "-"*40,
-                f"Total sleep periods: {sleep_summary.get('total_sleep_periods', 0)}",
-                f"Main sleep periods: {sleep_summary.get('main_sleep_periods', 0)}",
-                f"Total sleep time: {sleep_summary.get('total_sleep_time_hours', 0):.1f} hours",
-                f"Average sleep duration: {sleep_summary.get('average_sleep_duration_hours', 0):.1f} hours",
-                f"Average sleep efficiency: {sleep_summary.get('average_sleep_efficiency', 0):.1f}%",
-                f"Average sleep quality: {sleep_summary.get('average_sleep_quality_score', 0):.1f}/100",
-                "",
-            ])
+            parts.append(
+                f"SLEEP ANALYSIS\n"
+                f"{divider}\n"
+                f"Total sleep periods: {sleep_summary.get('total_sleep_periods', 0)}\n"
+                f"Main sleep periods: {sleep_summary.get('main_sleep_periods', 0)}\n"
+                f"Total sleep time: {sleep_summary.get('total_sleep_time_hours', 0):.1f} hours\n"
+                f"Average sleep duration: {sleep_summary.get('average_sleep_duration_hours', 0):.1f} hours\n"
+                f"Average sleep efficiency: {sleep_summary.get('average_sleep_efficiency', 0):.1f}%\n"
+                f"Average sleep quality: {sleep_summary.get('average_sleep_quality_score', 0):.1f}/100\n"
+                f"\n"
+            )
         
         # Sleep Regularity
         sleep_regularity = sleep_analysis.get('sleep_regularity', {})
         if sleep_regularity and not sleep_regularity.get('insufficient_data', False):
-            report_lines.extend([
-                "SLEEP REGULARITY",
-                "-"*40,
-                f"Sleep onset variability: {sleep_regularity.get('sleep_onset_variability_hours', 0):.1f} hours",
-                f"Wake time variability: {sleep_regularity.get('wake_time_variability_hours', 0):.1f} hours",
-                f"Sleep regularity index: {sleep_regularity.get('sleep_regularity_index', 0):.1f}/100",
-                "",
-            ])
+            parts.append(
+                f"SLEEP REGULARITY\n"
+                f"{divider}\n"
+                f"Sleep onset variability: {sleep_regularity.get('sleep_onset_variability_hours', 0):.1f} hours\n"
+                f"Wake time variability: {sleep_regularity.get('wake_time_variability_hours', 0):.1f} hours\n"
+                f"Sleep regularity index: {sleep_regularity.get('sleep_regularity_index', 0):.1f}/100\n"
+                f"\n"
+            )
         
         # Key Findings
-        key_findings = self._extract_key_findings(analysis_results)
         if key_findings:
-            report_lines.extend([
-                "KEY FINDINGS",
-                "-"*40,
-                *[f"• {finding}" for finding in key_findings],
-                "",
-            ])
-        
-        report_lines.extend([
-            "="*80,
-            "End of Report",
-            "="*80
-        ])
-        
-        return "\n".join(report_lines)
+            parts.append(
+                f"KEY FINDINGS\n"
+                f"{divider}\n" + "".join(f"• {finding}\n" for finding in key_findings) + "\n"
+            )
+        
+        parts.append(f"{rule}\nEnd of Report\n{rule}")
+        
+        return "".join(parts)
     
     def _extract_key_findings(self, analysis_results: Dict) -> List[str]:
         """Extract key findings from analysis results."""
         findings = []
         
-        # Quality findings
-        quality_assessment = analysis_results.get('quality_assessment', {})
-        if quality_assessment:
-            overall_score = quality_assessment.get('overall_assessment', {}).get('overall_score', 0)
+        # Bind each result section once
+        quality_assessment = analysis_results.get('quality_assessment') or {}
+        activity_levels = analysis_results.get('core_analysis', {}).get('activity_levels', {})
+        activity_analysis = analysis_results.get('activity_analysis', {})
+        sleep_analysis = analysis_results.get('sleep_analysis', {})
+        sleep_summary = sleep_analysis.get('sleep_summary', {})
+        sleep_regularity = sleep_analysis.get('sleep_regularity', {})
+        
+        # Quality findings (only for reports that include the overall assessment)
+        overall_assessment = quality_assessment.get('overall_assessment')
+        if overall_assessment:
+            overall_score = overall_assessment.get('overall_score', 0)
             if overall_score >= 90:
                 findings.append("Excellent data quality detected")
             elif overall_score < 60:
                 findings.append("Poor data quality detected - consider data exclusion")
         
         # Activity findings
-        activity_levels = analysis_results.get('core_analysis', {}).get('activity_levels', {})
         if activity_levels:
             sedentary_pct = activity_levels.get('sedentary_percentage', 0)
             mvpa_minutes = activity_levels.get('mvpa_minutes', 0)
@@ -322,7 +511,6 @@ class ReportGenerator:
                 findings.append("Very high activity levels detected")
         
         # Activity bout findings
-        activity_analysis = analysis_results.get('activity_analysis', {})
         if activity_analysis and 'summary_metrics' in activity_analysis:
             summary = activity_analysis['summary_metrics']
             if summary.get('meets_who_mvpa_guidelines', False):
@@ -331,7 +519,6 @@ class ReportGenerator:
                 findings.append("No sustained MVPA bouts detected")
         
         # Sleep findings
-        sleep_summary = analysis_results.get('sleep_analysis', {}).get('sleep_summary', {})
         if sleep_summary:
             avg_sleep_duration = sleep_summary.get('average_sleep_duration_hours', 0)
             avg_sleep_efficiency = sleep_summary.get('average_sleep_efficiency', 0)
@@ -347,7 +534,6 @@ class ReportGenerator:
                 findings.append("Excellent sleep efficiency detected")
         
         # Sleep regularity findings
-        sleep_regularity = analysis_results.get('sleep_analysis', {}).get('sleep_regularity', {})
         if sleep_regularity and not sleep_regularity.get('insufficient_data', False):
             regularity_index = sleep_regularity.get('sleep_regularity_index', 0)
             if regularity_index > 80:
@@ -357,54 +543,46 @@ class ReportGenerator:
         
         return findings
     
+    @staticmethod
+    def _extract_summary_row(result: Dict) -> Tuple:
+        """Pull one batch summary row, in BATCH_SUMMARY_COLUMNS order, from a file result."""
+        participant_id = result.get('participant_id', 'unknown')
+        status = result.get('status', 'unknown')
+        if status != 'success':
+            return (participant_id, status, 0, 0, 0, 0, 0)
+        
+        analysis_results = result.get('analysis_results') or {}
+        quality_assessment = analysis_results.get('quality_assessment') or {}
+        core_analysis = analysis_results.get('core_analysis') or {}
+        wear_detection = core_analysis.get('wear_detection') or {}
+        activity_levels = core_analysis.get('activity_levels') or {}
+        sleep_summary = (analysis_results.get('sleep_analysis') or {}).get('sleep_summary') or {}
+        
+        return (
+            participant_id,
+            status,
+            (quality_assessment.get('overall_assessment') or {}).get('overall_score', 0),
+            wear_detection.get('total_wear_time_hours', 0),
+            activity_levels.get('mvpa_minutes', 0),
+            sleep_summary.get('total_sleep_time_hours', 0),
+            sleep_summary.get('average_sleep_efficiency', 0)
+        )
+    
     def generate_batch_summary(self, batch_results: List[Dict]) -> str:
         """Generate summary report for multiple participants."""
         logger.info(f"Generating batch summary for {len(batch_results)} participants")
         
-        summary_file = os.path.join(self.output_dir, "batch_summary.csv")
-        
-        # Extract key metrics for each participant
-        summary_data = []
-        for result in batch_results:
-            participant_data = {
-                'participant_id': result.get('participant_id', 'unknown'),
-                'processing_status': result.get('status', 'unknown'),
-                'quality_score': 0,
-                'wear_time_hours': 0,
-                'mvpa_minutes': 0,
-                'sleep_hours': 0,
-                'sleep_efficiency': 0
-            }
-            
-            if result.get('status') == 'success':
-                analysis_results = result.get('analysis_results', {})
-                
-                # Quality score
-                quality_assessment = analysis_results.get('quality_assessment', {})
-                if quality_assessment:
-                    participant_data['quality_score'] = quality_assessment.get('overall_assessment', {}).get('overall_score', 0)
-                
-                # Activity metrics
-                core_analysis = analysis_results.get('core_analysis', {})
-                if core_analysis:
-                    wear_detection = core_analysis.get('wear_detection', {})
-                    activity_levels = core_analysis.get('activity_levels', {})
-                    
-                    participant_data['wear_time_hours'] = wear_detection.get('total_wear_time_hours', 0)
-                    participant_data['mvpa_minutes'] = activity_levels.get('mvpa_minutes', 0)
-                
-                # Sleep metrics
-                sleep_analysis = analysis_results.get('sleep_analysis', {})
-                if sleep_analysis:
-                    sleep_summary = sleep_analysis.get('sleep_summary', {})
-                    participant_data['sleep_hours'] = sleep_summary.get('total_sleep_time_hours', 0)
-                    participant_data['sleep_efficiency'] = sleep_summary.get('average_sleep_efficiency', 0)
-            
-            summary_data.append(participant_data)
+        summary_file = str(Path(self.output_dir) / "batch_summary.csv")
+        
+        # Extract key metrics for each participant in one pass over the results
+        summary_df = pd.DataFrame.from_records(
+            (self._extract_summary_row(result) for result in batch_results),
+            columns=BATCH_SUMMARY_COLUMNS
+        )
         
         # Save summary
-        summary_df = pd.DataFrame(summary_data)
-        summary_df.to_csv(summary_file, index=False)
+        with open(summary_file, 'w', buffering=WRITE_BUFFER_SIZE, newline='') as f:
+            summary_df.to_csv(f, **CSV_WRITE_OPTIONS)
         
         logger.info(f"Batch summary saved to {summary_file}")
         return summary_file
\ No newline at end of file
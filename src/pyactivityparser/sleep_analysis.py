@@ -8,7 +8,8 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 import logging
-from datetime import datetime, timedelta
+
+from ._kernels import rolling_mean_below, scan_sleep_segment, widen_float32
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +23,9 @@ class SleepAnalysis:
     
     def __init__(self, sample_rate_seconds: int = 5):
         self.sample_rate_seconds = sample_rate_seconds
+        self._win_5min = max(1, 300 // sample_rate_seconds)
+        self._acc = None
+        self._timestamps = None
         
         # Sleep detection parameters
         self.sleep_params = {
@@ -50,23 +54,28 @@ class SleepAnalysis:
             logger.warning("No timestamp column available for sleep analysis")
             return {}
         
-        # Detect rest periods
+        # Columns captured once (the acceleration as a view, as core analysis stores
+        # float32) and shared by the rest detection and per-period scans below
+        self._acc = data['acceleration'].to_numpy(dtype=np.float32, copy=False)
+        self._timestamps = pd.DatetimeIndex(data['timestamp'])
+        
+        # Detect rest periods (columnar; dict records are only built for the results)
         rest_periods = self._detect_rest_periods(data)
         
         # Identify sleep periods from rest periods
         sleep_periods = self._identify_sleep_periods(rest_periods, data)
         
-        # Analyze sleep characteristics
-        sleep_characteristics = self._analyze_sleep_characteristics(sleep_periods, data)
+        # Analyze sleep characteristics (records plus their columnar view)
+        sleep_characteristics, characteristic_columns = self._analyze_sleep_characteristics(sleep_periods, data)
         
         # Calculate sleep summary metrics
-        sleep_summary = self._calculate_sleep_summary(sleep_periods, sleep_characteristics)
+        sleep_summary = self._calculate_sleep_summary(sleep_periods, characteristic_columns)
         
         # Analyze sleep regularity
-        sleep_regularity = self._analyze_sleep_regularity(sleep_periods)
+        sleep_regularity = self._analyze_sleep_regularity(characteristic_columns)
         
         results = {
-            'rest_periods': rest_periods,
+            'rest_periods': self._periods_as_records(rest_periods),
             'sleep_periods': sleep_periods,
             'sleep_characteristics': sleep_characteristics,
             'sleep_summary': sleep_summary,
@@ -76,150 +85,168 @@ class SleepAnalysis:
         logger.info(f"Sleep analysis completed. Found {len(sleep_periods)} sleep periods")
         return results
     
-    def _detect_rest_periods(self, data: pd.DataFrame) -> List[Dict]:
+    def _detect_rest_periods(self, data: pd.DataFrame) -> Dict[str, np.ndarray]:
         """
         Detect periods of low activity that might indicate rest or sleep.
         
-        Uses a simple threshold-based approach.
+        Uses a simple threshold-based approach. Returns the periods as columns
+        (see `_describe_periods`).
         """
-        # Calculate rolling average to smooth the data
-        window_size = max(1, 300 // self.sample_rate_seconds)  # 5-minute rolling window
-        data_smooth = data.copy()
-        data_smooth['acceleration_smooth'] = data['acceleration'].rolling(
-            window=window_size, min_periods=1
-        ).mean()
-        
-        # Identify inactive periods
-        inactive_mask = data_smooth['acceleration_smooth'] < self.sleep_params['inactivity_threshold_mg']
+        # Identify inactive periods from the rolling average (5-minute window),
+        # computed in one pass without materializing the smoothed series
+        inactive_mask = rolling_mean_below(self._acc, self._win_5min, self.sleep_params['inactivity_threshold_mg'],
+                                           np.empty(len(self._acc), dtype=np.bool_))
         
         # Find continuous inactive periods
         rest_periods = self._find_continuous_periods(inactive_mask, data)
         
         # Filter by minimum duration
-        min_samples = int(self.sleep_params['min_rest_period_minutes'] * 60 / self.sample_rate_seconds)
-        filtered_periods = [period for period in rest_periods 
-                          if period['duration_minutes'] >= self.sleep_params['min_rest_period_minutes']]
+        keep = rest_periods['duration_minutes'] >= self.sleep_params['min_rest_period_minutes']
+        filtered_periods = {name: column[keep] for name, column in rest_periods.items()}
         
-        logger.info(f"Detected {len(filtered_periods)} rest periods")
+        logger.info(f"Detected {int(np.count_nonzero(keep))} rest periods")
         return filtered_periods
     
-    def _find_continuous_periods(self, mask: pd.Series, data: pd.DataFrame) -> List[Dict]:
-        """Find continuous periods where mask is True."""
-        periods = []
-        
-        if mask.sum() == 0:
-            return periods
-        
-        # Find transitions
-        mask_diff = mask.astype(int).diff()
-        starts = mask_diff[mask_diff == 1].index
-        ends = mask_diff[mask_diff == -1].index
-        
-        # Handle edge cases
-        if mask.iloc[0]:
-            starts = [mask.index[0]] + list(starts)
-        if mask.iloc[-1]:
-            ends = list(ends) + [mask.index[-1]]
-        
-        for start_idx, end_idx in zip(starts, ends):
-            period_data = data.loc[start_idx:end_idx]
-            duration_minutes = (end_idx - start_idx + 1) * self.sample_rate_seconds / 60
-            
-            period = {
-                'start_time': period_data['timestamp'].iloc[0],
-                'end_time': period_data['timestamp'].iloc[-1],
-                'start_index': start_idx,
-                'end_index': end_idx,
-                'duration_minutes': duration_minutes,
-                'mean_acceleration': float(period_data['acceleration'].mean()),
-                'min_acceleration': float(period_data['acceleration'].min()),
-                'max_acceleration': float(period_data['acceleration'].max())
-            }
-            
-            periods.append(period)
+    def _find_continuous_periods(self, mask: np.ndarray, data: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Find continuous periods where mask (aligned with the rows of data) is True."""
+        mask = np.asarray(mask, dtype=np.bool_)
+        
+        # Rising edges are run starts, falling edges are run ends; padding both sides
+        # handles runs touching the first or last sample. A period ends on the falling
+        # edge itself (the first sample after the run) unless the run reaches the end
+        edges = np.flatnonzero(np.diff(mask.astype(np.int8), prepend=0, append=0))
+        return self._describe_periods(edges[0::2], np.minimum(edges[1::2], len(mask) - 1), data)
+    
+    def _describe_periods(self, starts: np.ndarray, ends: np.ndarray, data: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Columnar period table for the inclusive row positions [start, end] of data.
         
-        return periods
+        One entry per period in every column: the timestamps as DatetimeIndex, index
+        labels, durations and acceleration stats as numpy arrays.
+        """
+        # Per-period acceleration mean/min/max from one reduceat each over the
+        # [start, end] segments; missing samples are skipped, as in pandas' reductions.
+        # Only the span covered by the periods is converted and scanned
+        if len(starts):
+            acc = self._acc[starts[0]:ends[-1] + 1].astype(np.float64)
+            segment_bounds = np.column_stack((starts, ends + 1)).ravel() - starts[0]
+            if segment_bounds[-1] == len(acc):
+                segment_bounds = segment_bounds[:-1]
+            valid = ~np.isnan(acc)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                means = (np.add.reduceat(np.where(valid, acc, 0.0), segment_bounds)[0::2] /
+                         np.add.reduceat(valid, segment_bounds)[0::2])
+            mins = np.fmin.reduceat(acc, segment_bounds)[0::2]
+            maxes = np.fmax.reduceat(acc, segment_bounds)[0::2]
+        else:
+            means = mins = maxes = np.empty(0)
+        
+        return {
+            'start_time': self._timestamps[starts],
+            'end_time': self._timestamps[ends],
+            'start_index': data.index[starts].to_numpy(),
+            'end_index': data.index[ends].to_numpy(),
+            'duration_minutes': (ends - starts + 1) * self.sample_rate_seconds / 60,
+            'mean_acceleration': means,
+            'min_acceleration': widen_float32(mins),  # Recorded decimals, not float32 rounding
+            'max_acceleration': widen_float32(maxes)
+        }
+    
+    def _periods_as_records(self, periods: Dict[str, np.ndarray]) -> List[Dict]:
+        """Materialize the per-period dict view of a columnar period table for list-based consumers."""
+        # tolist() yields native ints/floats and pd.Timestamp values
+        names = list(periods)
+        columns = [periods[name].tolist() for name in names]
+        return [dict(zip(names, row)) for row in zip(*columns)]
     
-    def _identify_sleep_periods(self, rest_periods: List[Dict], data: pd.DataFrame) -> List[Dict]:
+    def _identify_sleep_periods(self, rest_periods: Dict[str, np.ndarray], data: pd.DataFrame) -> List[Dict]:
         """
         Identify which rest periods are likely to be sleep periods.
         
         Uses heuristics based on timing and duration.
         """
-        sleep_periods = []
+        # Hours of all period bounds in one vectorized access each
+        start_hours = rest_periods['start_time'].hour.to_numpy()
+        end_hours = rest_periods['end_time'].hour.to_numpy()
+        duration_hours = rest_periods['duration_minutes'] / 60
         
-        for period in rest_periods:
-            start_time = pd.to_datetime(period['start_time'])
-            end_time = pd.to_datetime(period['end_time'])
-            duration_hours = period['duration_minutes'] / 60
-            
-            # Check if period falls within typical sleep hours and has reasonable duration
-            is_sleep = self._is_likely_sleep_period(start_time, end_time, duration_hours)
-            
-            if is_sleep:
-                sleep_period = period.copy()
-                sleep_period['sleep_type'] = self._classify_sleep_type(start_time, duration_hours)
-                sleep_periods.append(sleep_period)
+        # Check if each period falls within typical sleep hours and has reasonable duration
+        is_sleep = np.flatnonzero(self._is_likely_sleep_period(start_hours, end_hours, duration_hours))
+        
+        # Sort by start time (one stable argsort on the timestamps; ties keep detection order)
+        order = is_sleep[np.argsort(rest_periods['start_time'][is_sleep], kind='stable')]
+        sleep_types = self._classify_sleep_type(start_hours[order], duration_hours[order])
         
-        # Sort by start time
-        sleep_periods = sorted(sleep_periods, key=lambda x: x['start_time'])
+        sleep_periods = self._periods_as_records({name: column[order] for name, column in rest_periods.items()})
+        for sleep_period, sleep_type in zip(sleep_periods, sleep_types.tolist()):
+            sleep_period['sleep_type'] = sleep_type
         
-        logger.info(f"Identified {len(sleep_periods)} sleep periods from {len(rest_periods)} rest periods")
+        logger.info(f"Identified {len(sleep_periods)} sleep periods from {len(duration_hours)} rest periods")
         return sleep_periods
     
-    def _is_likely_sleep_period(self, start_time: datetime, end_time: datetime, duration_hours: float) -> bool:
-        """Determine if a rest period is likely to be sleep."""
+    def _is_likely_sleep_period(self, start_hours: np.ndarray, end_hours: np.ndarray,
+                                duration_hours: np.ndarray) -> np.ndarray:
+        """Determine which rest periods are likely to be sleep (one boolean per period)."""
         # Check duration constraints
-        if (duration_hours < self.sleep_params['min_sleep_duration_hours'] or 
-            duration_hours > self.sleep_params['max_sleep_duration_hours']):
-            return False
+        duration_ok = ((duration_hours >= self.sleep_params['min_sleep_duration_hours']) &
+                       (duration_hours <= self.sleep_params['max_sleep_duration_hours']))
         
         # Check timing - sleep should start in evening/night and end in morning/afternoon
-        start_hour = start_time.hour
-        end_hour = end_time.hour
-        
         # Sleep window: 6 PM to 12 PM next day
-        starts_in_evening = start_hour >= self.sleep_params['sleep_window_start_hour'] or start_hour <= 6
-        ends_in_morning = end_hour <= self.sleep_params['sleep_window_end_hour']
+        starts_in_evening = (start_hours >= self.sleep_params['sleep_window_start_hour']) | (start_hours <= 6)
+        ends_in_morning = end_hours <= self.sleep_params['sleep_window_end_hour']
         
-        return starts_in_evening and ends_in_morning
+        return duration_ok & starts_in_evening & ends_in_morning
     
-    def _classify_sleep_type(self, start_time: datetime, duration_hours: float) -> str:
-        """Classify the type of sleep period."""
-        start_hour = start_time.hour
-        
-        if 6 <= start_hour <= 18:  # 6 AM to 6 PM
-            if duration_hours <= 2:
-                return 'nap'
-            else:
-                return 'daytime_sleep'
-        else:  # Evening/night/early morning
-            return 'main_sleep'
+    def _classify_sleep_type(self, start_hours: np.ndarray, duration_hours: np.ndarray) -> np.ndarray:
+        """Classify the type of each sleep period."""
+        # 6 AM to 6 PM: naps (up to 2 hours) or daytime sleep; evening/night/early morning: main sleep
+        daytime = (start_hours >= 6) & (start_hours <= 18)
+        return np.where(daytime, np.where(duration_hours <= 2, 'nap', 'daytime_sleep'), 'main_sleep')
     
-    def _analyze_sleep_characteristics(self, sleep_periods: List[Dict], data: pd.DataFrame) -> List[Dict]:
-        """Analyze detailed characteristics of each sleep period."""
+    def _analyze_sleep_characteristics(self, sleep_periods: List[Dict],
+                                       data: pd.DataFrame) -> Tuple[List[Dict], Dict[str, np.ndarray]]:
+        """
+        Analyze detailed characteristics of each sleep period.
+        
+        Returns the per-period records and a columnar view of the fields the summary
+        and regularity steps reduce over (timing, type, sleep time, efficiency,
+        awakening count and quality score).
+        """
         characteristics = []
+        columns = {name: [] for name in ('start_time', 'end_time', 'sleep_type', 'estimated_sleep_duration_minutes',
+                                         'sleep_efficiency_percentage', 'awakening_count')}
+        movement_variability = []
+        
+        awakening_threshold = 50  # mg - threshold for potential awakening
+        min_awakening_duration = 1  # minutes
+        sleep_threshold = 20  # mg - periods above this are excluded from actual sleep time
         
         for sleep_period in sleep_periods:
-            start_idx = sleep_period['start_index']
-            end_idx = sleep_period['end_index']
-            sleep_data = data.loc[start_idx:end_idx]
+            start_pos, end_pos = data.index.slice_locs(sleep_period['start_index'], sleep_period['end_index'])
+            
+            # Awakening runs, actual sleep samples and movement statistics from one scan
+            awakening_starts, awakening_ends, sleep_samples, mean_acc, std_acc = scan_sleep_segment(
+                self._acc[start_pos:end_pos], awakening_threshold, sleep_threshold
+            )
             
-            # Calculate sleep fragmentation (number of brief awakenings)
-            awakening_threshold = 50  # mg - threshold for potential awakening
-            awakenings = self._detect_awakenings(sleep_data, awakening_threshold)
+            # Calculate sleep fragmentation (brief awakenings of at least 1 minute)
+            awakening_minutes = (awakening_ends - awakening_starts + 1) * self.sample_rate_seconds / 60
+            keep = awakening_minutes >= min_awakening_duration
+            awakenings = self._periods_as_records(self._describe_periods(
+                awakening_starts[keep] + start_pos, awakening_ends[keep] + start_pos, data
+            ))
             
             # Calculate sleep efficiency (time actually sleeping vs time in bed)
             total_duration = sleep_period['duration_minutes']
-            actual_sleep_time = self._estimate_actual_sleep_time(sleep_data)
+            actual_sleep_time = sleep_samples * self.sample_rate_seconds / 60
             sleep_efficiency = (actual_sleep_time / total_duration) * 100 if total_duration > 0 else 0
             
             # Movement during sleep
             movement_stats = {
-                'mean_acceleration': float(sleep_data['acceleration'].mean()),
-                'std_acceleration': float(sleep_data['acceleration'].std()),
-                'movement_variability': float(sleep_data['acceleration'].std() / sleep_data['acceleration'].mean()) 
-                                      if sleep_data['acceleration'].mean() > 0 else 0
+                'mean_acceleration': mean_acc,
+                'std_acceleration': std_acc,
+                'movement_variability': std_acc / mean_acc if mean_acc > 0 else 0
             }
             
             char = {
@@ -232,110 +259,95 @@ class SleepAnalysis:
                 'sleep_efficiency_percentage': sleep_efficiency,
                 'awakening_count': len(awakenings),
                 'awakening_details': awakenings,
-                'movement_during_sleep': movement_stats,
-                'sleep_quality_score': self._calculate_sleep_quality_score(
-                    sleep_efficiency, len(awakenings), movement_stats['movement_variability']
-                )
+                'movement_during_sleep': movement_stats
             }
             
             characteristics.append(char)
+            for name, column in columns.items():
+                column.append(char[name])
+            movement_variability.append(movement_stats['movement_variability'])
+        
+        columns = {
+            'start_time': pd.DatetimeIndex(columns['start_time']),
+            'end_time': pd.DatetimeIndex(columns['end_time']),
+            'sleep_type': np.array(columns['sleep_type'], dtype=str),
+            'estimated_sleep_duration_minutes': np.array(columns['estimated_sleep_duration_minutes'], dtype=np.float64),
+            'sleep_efficiency_percentage': np.array(columns['sleep_efficiency_percentage'], dtype=np.float64),
+            'awakening_count': np.array(columns['awakening_count'], dtype=np.float64),
+            'movement_variability': np.array(movement_variability, dtype=np.float64)
+        }
         
-        return characteristics
-    
-    def _detect_awakenings(self, sleep_data: pd.DataFrame, threshold: float) -> List[Dict]:
-        """Detect potential brief awakenings during sleep."""
-        awakening_mask = sleep_data['acceleration'] > threshold
-        awakenings = self._find_continuous_periods(awakening_mask, sleep_data)
+        # Quality scores of all periods in one vectorized evaluation
+        columns['sleep_quality_score'] = self._calculate_sleep_quality_score(
+            columns['sleep_efficiency_percentage'], columns['awakening_count'], columns['movement_variability']
+        )
+        for char, quality_score in zip(characteristics, columns['sleep_quality_score'].tolist()):
+            char['sleep_quality_score'] = quality_score
         
-        # Filter awakenings that are at least 1 minute long
-        min_awakening_duration = 1  # minutes
-        filtered_awakenings = [awk for awk in awakenings 
-                             if awk['duration_minutes'] >= min_awakening_duration]
-        
-        return filtered_awakenings
-    
-    def _estimate_actual_sleep_time(self, sleep_data: pd.DataFrame) -> float:
-        """Estimate actual sleep time by excluding periods of high movement."""
-        # Simple approach: exclude periods where acceleration > 20mg
-        sleep_threshold = 20  # mg
-        actual_sleep_mask = sleep_data['acceleration'] <= sleep_threshold
-        actual_sleep_samples = actual_sleep_mask.sum()
-        actual_sleep_minutes = actual_sleep_samples * self.sample_rate_seconds / 60
-        
-        return actual_sleep_minutes
+        return characteristics, columns
     
-    def _calculate_sleep_quality_score(self, efficiency: float, awakening_count: int, 
-                                     movement_variability: float) -> float:
-        """Calculate a sleep quality score (0-100)."""
+    def _calculate_sleep_quality_score(self, efficiency: np.ndarray, awakening_count: np.ndarray, 
+                                     movement_variability: np.ndarray) -> np.ndarray:
+        """Calculate sleep quality scores (0-100), one per sleep period."""
         # Start with efficiency score
         quality_score = efficiency
         
         # Penalize for frequent awakenings
-        awakening_penalty = min(20, awakening_count * 2)
-        quality_score -= awakening_penalty
+        awakening_penalty = np.minimum(20, awakening_count * 2)
+        quality_score = quality_score - awakening_penalty
         
-        # Penalize for high movement variability
-        movement_penalty = min(10, movement_variability * 10)
-        quality_score -= movement_penalty
+        # Penalize for high movement variability (an undefined variability takes the full penalty)
+        movement_penalty = np.fmin(10, movement_variability * 10)
+        quality_score = quality_score - movement_penalty
         
-        return max(0, min(100, quality_score))
+        return np.clip(quality_score, 0, 100)
     
     def _calculate_sleep_summary(self, sleep_periods: List[Dict], 
-                               sleep_characteristics: List[Dict]) -> Dict:
-        """Calculate overall sleep summary metrics."""
+                               characteristic_columns: Dict[str, np.ndarray]) -> Dict:
+        """Calculate overall sleep summary metrics (from `_analyze_sleep_characteristics` columns)."""
         if not sleep_periods:
             return {}
         
-        main_sleep_periods = [char for char in sleep_characteristics 
-                            if char['sleep_type'] == 'main_sleep']
-        nap_periods = [char for char in sleep_characteristics 
-                      if char['sleep_type'] == 'nap']
+        sleep_types = characteristic_columns['sleep_type']
+        main_sleep = sleep_types == 'main_sleep'
+        nap = sleep_types == 'nap'
+        sleep_minutes = characteristic_columns['estimated_sleep_duration_minutes']
+        main_sleep_count = int(np.count_nonzero(main_sleep))
         
         summary = {
             'total_sleep_periods': len(sleep_periods),
-            'main_sleep_periods': len(main_sleep_periods),
-            'nap_periods': len(nap_periods),
-            'total_sleep_time_hours': sum(char['estimated_sleep_duration_minutes'] 
-                                        for char in sleep_characteristics) / 60,
-            'main_sleep_time_hours': sum(char['estimated_sleep_duration_minutes'] 
-                                       for char in main_sleep_periods) / 60,
-            'nap_time_hours': sum(char['estimated_sleep_duration_minutes'] 
-                                for char in nap_periods) / 60
+            'main_sleep_periods': main_sleep_count,
+            'nap_periods': int(np.count_nonzero(nap)),
+            'total_sleep_time_hours': float(sleep_minutes.sum()) / 60,
+            'main_sleep_time_hours': float(sleep_minutes[main_sleep].sum()) / 60,
+            'nap_time_hours': float(sleep_minutes[nap].sum()) / 60
         }
         
-        if main_sleep_periods:
+        if main_sleep_count:
             summary.update({
-                'average_sleep_duration_hours': np.mean([char['estimated_sleep_duration_minutes'] 
-                                                       for char in main_sleep_periods]) / 60,
-                'average_sleep_efficiency': np.mean([char['sleep_efficiency_percentage'] 
-                                                   for char in main_sleep_periods]),
-                'average_awakening_count': np.mean([char['awakening_count'] 
-                                                  for char in main_sleep_periods]),
-                'average_sleep_quality_score': np.mean([char['sleep_quality_score'] 
-                                                      for char in main_sleep_periods])
+                'average_sleep_duration_hours': float(sleep_minutes[main_sleep].mean()) / 60,
+                'average_sleep_efficiency': float(characteristic_columns['sleep_efficiency_percentage'][main_sleep].mean()),
+                'average_awakening_count': float(characteristic_columns['awakening_count'][main_sleep].mean()),
+                'average_sleep_quality_score': float(characteristic_columns['sleep_quality_score'][main_sleep].mean())
             })
         
         return summary
     
-    def _analyze_sleep_regularity(self, sleep_periods: List[Dict]) -> Dict:
-        """Analyze sleep timing regularity."""
-        main_sleep_periods = [period for period in sleep_periods 
-                            if period.get('sleep_type') == 'main_sleep']
+    def _analyze_sleep_regularity(self, characteristic_columns: Dict[str, np.ndarray]) -> Dict:
+        """Analyze sleep timing regularity (from `_analyze_sleep_characteristics` columns)."""
+        main_sleep = characteristic_columns['sleep_type'] == 'main_sleep'
         
-        if len(main_sleep_periods) < 2:
+        if np.count_nonzero(main_sleep) < 2:
             return {'insufficient_data': True}
         
         # Extract sleep onset and wake times
-        sleep_onsets = [pd.to_datetime(period['start_time']).hour + 
-                       pd.to_datetime(period['start_time']).minute / 60 
-                       for period in main_sleep_periods]
-        
-        wake_times = [pd.to_datetime(period['end_time']).hour + 
-                     pd.to_datetime(period['end_time']).minute / 60 
-                     for period in main_sleep_periods]
+        starts = characteristic_columns['start_time'][main_sleep]
+        ends = characteristic_columns['end_time'][main_sleep]
+        sleep_onsets = starts.hour.to_numpy() + starts.minute.to_numpy() / 60
+        wake_times = ends.hour.to_numpy() + ends.minute.to_numpy() / 60
         
         # Handle times that cross midnight
-        sleep_onsets = [time if time <= 12 else time - 24 for time in sleep_onsets]
+        sleep_onsets = np.where(sleep_onsets <= 12, sleep_onsets, sleep_onsets - 24)
         
         regularity = {
             'sleep_onset_variability_hours': float(np.std(sleep_onsets)),
@@ -349,8 +361,8 @@ class SleepAnalysis:
         
         return regularity
     
-    def _calculate_sleep_regularity_index(self, sleep_onsets: List[float], 
-                                        wake_times: List[float]) -> float:
+    def _calculate_sleep_regularity_index(self, sleep_onsets: np.ndarray, 
+                                        wake_times: np.ndarray) -> float:
         """
         Calculate a sleep regularity index (0-100).
         
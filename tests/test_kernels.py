@@ -0,0 +1,244 @@
+"""
+Tests for the numerical kernels in pyactivityparser._kernels.
+
+Every kernel runs under both backends (the NumPy/pandas fallback and, when Numba is
+installed, the JIT-compiled path) on float32 recordings with missing samples and runs
+touching either end, and is compared against a pandas reference with the semantics of
+the original per-sample code.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyactivityparser import _kernels
+
+BACKENDS = [
+    'numpy',
+    pytest.param('numba', marks=pytest.mark.skipif(not _kernels.NUMBA_AVAILABLE,
+                                                   reason='numba is not installed')),
+]
+
+
+@pytest.fixture(params=BACKENDS)
+def kernels(request, monkeypatch):
+    """The kernels module with the dispatchers pinned to one backend."""
+    monkeypatch.setattr(_kernels, 'NUMBA_AVAILABLE', request.param == 'numba')
+    return _kernels
+
+
+def make_acceleration(n_samples: int = 5000, seed: int = 0, missing: float = 0.05) -> np.ndarray:
+    """Recording-like float32 mg values (one decimal) with missing samples and active ends."""
+    rng = np.random.default_rng(seed)
+    acc = np.round(rng.gamma(0.6, 20.0, n_samples), 1)
+    acc[rng.random(n_samples) < 0.1] = 0.0
+    acc[rng.random(n_samples) < missing] = np.nan
+    acc[400:520] = np.nan  # A gap longer than the rolling windows below
+    acc[:30] = 150.0  # Runs above every threshold at both ends
+    acc[-30:] = 150.0
+    return acc.astype(np.float32)
+
+
+def reference_runs(mask: np.ndarray) -> pd.DataFrame:
+    """First and last position of every run of True in `mask`."""
+    positions = pd.Series(np.arange(len(mask)))
+    run_ids = pd.Series(mask).ne(pd.Series(mask).shift()).cumsum()
+    runs = positions[mask].groupby(run_ids[mask]).agg(['first', 'last'])
+    return runs.reset_index(drop=True)
+
+
+class TestFindBouts:
+    """Run-length bouts with per-bout mean and max."""
+
+    @pytest.mark.parametrize('min_samples', [1, 12])
+    @pytest.mark.parametrize('mask_kind', ['threshold', 'all_true', 'all_false'])
+    def test_matches_pandas(self, kernels, min_samples, mask_kind):
+        acc = make_acceleration()
+        if mask_kind == 'threshold':
+            mask = acc >= 40
+        elif mask_kind == 'all_true':
+            acc = np.nan_to_num(acc)
+            mask = np.ones(len(acc), dtype=bool)
+        else:
+            mask = np.zeros(len(acc), dtype=bool)
+
+        starts, ends, means, maxes = kernels.find_bouts(mask, acc, min_samples)
+
+        runs = reference_runs(mask)
+        runs = runs[runs['last'] - runs['first'] + 1 >= min_samples]
+        values = pd.Series(acc, dtype=np.float64)
+        expected_means = [values[first:last + 1].mean() for first, last in runs.to_numpy()]
+        expected_maxes = [values[first:last + 1].max() for first, last in runs.to_numpy()]
+
+        np.testing.assert_array_equal(starts, runs['first'])
+        np.testing.assert_array_equal(ends, runs['last'] + 1)
+        np.testing.assert_allclose(means, expected_means, rtol=1e-12)
+        np.testing.assert_array_equal(maxes, expected_maxes)
+        assert means.dtype == np.float64
+        assert maxes.dtype == np.float64
+
+
+class TestCalendarHistograms:
+    """Hour-of-day and day-of-week counts and NaN-skipping reductions."""
+
+    def test_matches_pandas(self, kernels):
+        acc = make_acceleration()
+        rng = np.random.default_rng(1)
+        hour = rng.integers(0, 23, len(acc)).astype(np.int8)  # Hour 23 stays empty
+        dow = rng.integers(0, 7, len(acc)).astype(np.int8)
+        code = np.searchsorted(np.array([5, 40, 100], dtype=np.float32), acc, side='right').astype(np.int8)
+        code[np.isnan(acc)] = -1
+
+        tables = kernels.calendar_histograms(hour, dow, code, acc)
+
+        frame = pd.DataFrame({'hour': hour, 'dow': dow, 'code': np.where(code < 0, 4, code),
+                              'acc': acc.astype(np.float64)})
+        frame['acc_sq'] = frame['acc'] ** 2
+        by_hour = frame.groupby('hour')
+        by_dow = frame.groupby('dow')
+        hours = range(24)
+
+        np.testing.assert_array_equal(
+            tables['hour_counts'],
+            pd.crosstab(frame['hour'], frame['code']).reindex(index=hours, columns=range(5), fill_value=0)
+        )
+        np.testing.assert_array_equal(
+            tables['dow_counts'],
+            pd.crosstab(frame['dow'], frame['code']).reindex(index=range(7), columns=range(5), fill_value=0)
+        )
+        np.testing.assert_allclose(tables['hour_sum'], by_hour['acc'].sum().reindex(hours, fill_value=0),
+                                   rtol=1e-12)
+        np.testing.assert_allclose(tables['hour_sumsq'], by_hour['acc_sq'].sum().reindex(hours, fill_value=0),
+                                   rtol=1e-12)
+        np.testing.assert_array_equal(tables['hour_max'], by_hour['acc'].max().reindex(hours).fillna(-np.inf))
+        np.testing.assert_allclose(tables['dow_sum'], by_dow['acc'].sum(), rtol=1e-12)
+
+
+class TestCountSpacedPeaks:
+    """Greedy refractory filter over peak candidates."""
+
+    @pytest.mark.parametrize('min_interval', [1, 3, 20])
+    def test_matches_sample_loop(self, kernels, min_interval):
+        acc = make_acceleration()
+        threshold = 50
+
+        # Per-sample loop of the original step estimate
+        expected = 0
+        last_peak = -min_interval
+        for i, value in enumerate(acc):
+            if value > threshold and i - last_peak >= min_interval:
+                expected += 1
+                last_peak = i
+
+        candidates = np.flatnonzero(acc > threshold)
+        assert kernels.count_spaced_peaks(candidates, min_interval) == expected
+
+    def test_no_candidates(self, kernels):
+        assert kernels.count_spaced_peaks(np.empty(0, dtype=np.int64), 5) == 0
+
+
+class TestRollingKernels:
+    """Trailing rolling statistics with missing samples skipped."""
+
+    window = 60
+
+    def test_rolling_std_threshold(self, kernels):
+        acc = make_acceleration()
+        threshold = 13.0
+        out = np.empty(len(acc), dtype=bool)
+
+        result = kernels.rolling_std_threshold(acc, self.window, threshold, out)
+
+        rolling_std = pd.Series(acc).rolling(window=self.window, min_periods=1).std().fillna(0).to_numpy()
+        decided = np.abs(rolling_std - threshold) > 1e-9
+        assert result is out
+        np.testing.assert_array_equal(out[decided], (rolling_std >= threshold)[decided])
+
+    def test_rolling_mean_below(self, kernels):
+        acc = make_acceleration()
+        threshold = 10.0
+        out = np.empty(len(acc), dtype=bool)
+
+        result = kernels.rolling_mean_below(acc, self.window, threshold, out)
+
+        rolling_mean = pd.Series(acc).rolling(window=self.window, min_periods=1).mean().to_numpy()
+        decided = np.isnan(rolling_mean) | (np.abs(rolling_mean - threshold) > 1e-9)
+        assert result is out
+        np.testing.assert_array_equal(out[decided], (rolling_mean < threshold)[decided])
+        assert not out[np.isnan(rolling_mean)].any()
+
+    def test_rolling_mean_std(self, kernels):
+        acc = make_acceleration()
+
+        means, stds = kernels.rolling_mean_std(acc, self.window)
+
+        rolling = pd.Series(acc).rolling(window=self.window, min_periods=1)
+        assert means.dtype == np.float32 and stds.dtype == np.float32
+        np.testing.assert_allclose(means, rolling.mean().to_numpy(), rtol=1e-5, atol=1e-4)
+        np.testing.assert_allclose(stds, rolling.std().to_numpy(), rtol=1e-5, atol=1e-4)
+
+
+class TestCounts:
+    """Per-recording flag and anomaly counts."""
+
+    def test_quality_counts(self, kernels):
+        acc = make_acceleration()
+        imputed = np.random.default_rng(2).random(len(acc)) < 0.1
+        series = pd.Series(acc)
+
+        counts = kernels.quality_counts(acc, imputed, 100.0)
+
+        assert counts == (int(series.isna().sum()), int((series == 0).sum()),
+                          int((series > 100).sum()), int(imputed.sum()))
+        assert all(type(count) is int for count in counts)
+
+    def test_outlier_counts(self, kernels):
+        acc = make_acceleration()
+        values = acc[~np.isnan(acc)]
+        series = pd.Series(values, dtype=np.float64)
+        q1, q3 = series.quantile([0.25, 0.75])
+        lower, upper = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+        mean, std = series.mean(), series.std()
+
+        counts = kernels.outlier_counts(values, lower, upper, mean, 3 * std)
+
+        assert counts == (int(((series < lower) | (series > upper)).sum()),
+                          int(((series - mean).abs() / std > 3).sum()))
+
+    def test_integrity_counts(self, kernels):
+        acc = make_acceleration()
+        acc[[5, 50, 500]] = [-150.0, -20.0, 2500.0]
+        series = pd.Series(acc)
+
+        counts = kernels.integrity_counts(acc, 2000, -100)
+
+        assert counts == (int((series == 0).sum()), int((series < 0).sum()),
+                          int((series > 2000).sum()), int((series < -100).sum()))
+
+
+class TestScanSleepSegment:
+    """Awakening runs and movement statistics of one sleep segment."""
+
+    @pytest.mark.parametrize('length', [0, 1, 5000])
+    def test_matches_pandas(self, kernels, length):
+        acc = make_acceleration()[:length]
+
+        starts, ends, sleep_samples, mean, std = kernels.scan_sleep_segment(acc, 50, 20)
+
+        # Runs end on the first sample back at or below the threshold, or the last sample
+        runs = reference_runs(acc > 50)
+        series = pd.Series(acc, dtype=np.float64)
+        np.testing.assert_array_equal(starts, runs['first'])
+        np.testing.assert_array_equal(ends, np.minimum(runs['last'] + 1, max(length - 1, 0)))
+        assert sleep_samples == int((series <= 20).sum())
+        np.testing.assert_allclose(mean, series.mean(), rtol=1e-10)
+        np.testing.assert_allclose(std, series.std(), rtol=1e-10)
+
+
+def test_widen_float32_recovers_recorded_decimals():
+    recorded = np.array([1350.3, 907.3, 3.8, 0.1, 119.7, 0.0, np.nan])
+    widened = _kernels.widen_float32(recorded.astype(np.float32))
+
+    np.testing.assert_array_equal(widened, recorded)
+    assert widened.dtype == np.float64
+    assert float(_kernels.widen_float32(np.float32(1350.3))) == 1350.3